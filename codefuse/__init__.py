@@ -2,7 +2,9 @@
 CodeFuse Agent - A lightweight, high-performance AI programming assistant framework
 """
 
+import importlib
 import importlib.metadata
+from typing import TYPE_CHECKING, Any, List
 
 try:
     __version__ = importlib.metadata.version("cfuse")
@@ -10,20 +12,63 @@ except importlib.metadata.PackageNotFoundError:
     # Development mode fallback
     __version__ = "0.1.0"
 
-from codefuse.llm import create_llm, Message, MessageRole, Tool, LLMResponse
-from codefuse.tools import BaseTool, ToolDefinition, ToolParameter, ToolResult, ToolRegistry
-from codefuse.core import (
-    EnvironmentInfo,
-    Session,
-    AgentProfile,
-    AgentProfileManager,
-    ContextEngine,
-    AgentLoop,
-    AgentEvent,
-)
-from codefuse.config import Config
+if TYPE_CHECKING:
+    from codefuse.llm import create_llm, Message, MessageRole, Tool, LLMResponse
+    from codefuse.tools import BaseTool, ToolDefinition, ToolParameter, ToolResult, ToolRegistry
+    from codefuse.core import (
+        EnvironmentInfo,
+        Session,
+        AgentProfile,
+        AgentProfileManager,
+        ContextEngine,
+        AgentLoop,
+        AgentEvent,
+    )
+    from codefuse.config import Config
 
-__all__ = [
+# Public name -> defining module. Submodules are imported on first attribute
+# access (PEP 562) so `import codefuse` stays cheap for short-lived CLI runs.
+_LAZY = {
+    # LLM
+    "create_llm": "codefuse.llm",
+    "Message": "codefuse.llm",
+    "MessageRole": "codefuse.llm",
+    "Tool": "codefuse.llm",
+    "LLMResponse": "codefuse.llm",
+    # Tools
+    "BaseTool": "codefuse.tools",
+    "ToolDefinition": "codefuse.tools",
+    "ToolParameter": "codefuse.tools",
+    "ToolResult": "codefuse.tools",
+    "ToolRegistry": "codefuse.tools",
+    # Core
+    "EnvironmentInfo": "codefuse.core",
+    "Session": "codefuse.core",
+    "AgentProfile": "codefuse.core",
+    "AgentProfileManager": "codefuse.core",
+    "ContextEngine": "codefuse.core",
+    "AgentLoop": "codefuse.core",
+    "AgentEvent": "codefuse.core",
+    # Config
+    "Config": "codefuse.config",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily exported names on first access"""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = (
     # LLM
     "create_llm",
     "Message",
@@ -46,5 +91,4 @@ __all__ = [
     "AgentEvent",
     # Config
     "Config",
-]
-
+)
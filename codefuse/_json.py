@@ -0,0 +1,52 @@
+"""
+JSON helpers - use orjson when it is installed, otherwise the stdlib json module
+
+All dumps helpers return UTF-8 bytes (non-ASCII characters are not escaped),
+so callers can hand the result straight to a binary sink.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    JSONDecodeError = orjson.JSONDecodeError
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+    
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to compact JSON bytes"""
+        return orjson.dumps(obj, option=_OPTIONS)
+    
+    def dumps_line(obj: Any) -> bytes:
+        """Serialize obj to compact JSON bytes terminated by a newline"""
+        return orjson.dumps(obj, option=_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+    
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Parse JSON from bytes or str"""
+        return orjson.loads(data)
+
+else:
+    JSONDecodeError = json.JSONDecodeError
+    
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to compact JSON bytes"""
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    
+    def dumps_line(obj: Any) -> bytes:
+        """Serialize obj to compact JSON bytes terminated by a newline"""
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+    
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Parse JSON from bytes or str"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+__all__ = ["JSONDecodeError", "dumps", "dumps_line", "loads"]
@@ -2,9 +2,34 @@
 CLI Module
 """
 
-from codefuse.cli.main import main
-from codefuse.cli.headless import run_headless
-from codefuse.cli.interactive import run_interactive
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["main", "run_headless", "run_interactive"]
+if TYPE_CHECKING:
+    from codefuse.cli.main import main
+    from codefuse.cli.headless import run_headless
+    from codefuse.cli.interactive import run_interactive
 
+# Loaded on first access so headless runs never import prompt_toolkit
+_LAZY = {
+    "main": "codefuse.cli.main",
+    "run_headless": "codefuse.cli.headless",
+    "run_interactive": "codefuse.cli.interactive",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve lazily exported names on first access"""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = ("main", "run_headless", "run_interactive")
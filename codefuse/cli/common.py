@@ -3,11 +3,10 @@ Common utilities for CLI - shared between headless and interactive modes
 """
 
 import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
-from rich.console import Console
-from rich.prompt import Confirm
-from rich.panel import Panel
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 from codefuse import create_llm
 from codefuse.config import Config
@@ -24,10 +23,36 @@ from codefuse.core import (
 )
 from codefuse.observability.trajectory import TrajectoryWriter
 from codefuse.observability.llm_messages import LLMMessagesWriter
+from codefuse.observability.logging import register_writer
 from codefuse.observability.logging.utils import path_to_slug
 from codefuse.llm.base import Message
+from codefuse.llm._http_pool import get_client
+
+# LLMConfig attributes forwarded to create_llm when set
+_LLM_ATTRS = (
+    "provider",
+    "api_key",
+    "base_url",
+    "temperature",
+    "max_tokens",
+    "timeout",
+    "parallel_tool_calls",
+    "enable_thinking",
+    "top_k",
+    "top_p",
+)
+
+# rich is imported on first print so non-rendering code paths skip its import cost
+_console = None
 
-console = Console()
+
+def _get_console():
+    """Get the shared rich Console, creating it on first use"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 
 def confirmation_callback(tool_name: str, tool_id: str, arguments: dict) -> bool:
@@ -42,6 +67,10 @@ def confirmation_callback(tool_name: str, tool_id: str, arguments: dict) -> bool
     Returns:
         True if confirmed, False otherwise
     """
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+    
+    console = _get_console()
     console.print()
     console.print(Panel(
         f"[yellow]Tool:[/yellow] {tool_name}\n"
@@ -60,6 +89,9 @@ def handle_list_agents(agent_manager: AgentProfileManager) -> None:
     Args:
         agent_manager: Agent profile manager instance
     """
+    from rich.panel import Panel
+    
+    console = _get_console()
     console.print("\n[bold]Available Agents:[/bold]\n")
     for agent_name in agent_manager.list_agents():
         info = agent_manager.get_agent_info(agent_name)
@@ -69,7 +101,7 @@ def handle_list_agents(agent_manager: AgentProfileManager) -> None:
 def check_and_load_existing_session(
     session_id: str,
     workspace_path: str,
-    logs_dir: str,
+    logs_dir: Union[str, Path],
 ) -> Optional[List[Message]]:
     """
     Check if a session already exists and load its conversation history
@@ -82,19 +114,23 @@ def check_and_load_existing_session(
     Returns:
         List of Message objects if session exists, None otherwise
     """
-    # Construct session directory path
-    base_logs_dir = Path(logs_dir).expanduser()
-    workspace_slug = path_to_slug(workspace_path)
-    session_dir = base_logs_dir / workspace_slug / session_id
-    llm_messages_file = session_dir / "llm_messages.json"
-    
-    # Check if session exists
-    if not llm_messages_file.exists():
+    # Probe with plain string paths; Path objects are only built on a hit
+    joined = os.path.join(
+        os.path.expanduser(logs_dir),
+        path_to_slug(workspace_path),
+        session_id,
+        "llm_messages.json",
+    )
+    
+    # Check if session exists (a journal alone means the last run was interrupted)
+    if not (os.path.exists(joined) or os.path.exists(os.path.splitext(joined)[0] + ".jsonl")):
         return None
+    llm_messages_file = Path(joined)
     
     # Try to load conversation history
     try:
         conversation_history = ContextEngine.load_conversation_history(llm_messages_file)
+        console = _get_console()
         console.print(f"[cyan]📂 Resuming session:[/cyan] {session_id}")
         console.print(f"[cyan]   Loaded {len(conversation_history)} messages from history[/cyan]\n")
         mainLogger.info(
@@ -104,6 +140,7 @@ def check_and_load_existing_session(
         )
         return conversation_history
     except Exception as e:
+        console = _get_console()
         console.print(f"[yellow]⚠️  Warning: Failed to load session history:[/yellow] {e}")
         console.print(f"[yellow]   Starting fresh session with ID: {session_id}[/yellow]\n")
         mainLogger.warning(
@@ -136,6 +173,7 @@ def _initialize_agent_profile(
     if agent_profile is None:
         agent_profile = agent_manager.get_agent(agent_name)
         if not agent_profile:
+            console = _get_console()
             console.print(f"[red]Error:[/red] Agent profile '{agent_name}' not found")
             console.print(f"Available agents: {', '.join(agent_manager.list_agents())}")
             raise ValueError(f"Agent profile not found: {agent_name}")
@@ -148,16 +186,15 @@ def _initialize_agent_profile(
 
 def _generate_session_id() -> str:
     """Generate a unique session ID"""
-    from datetime import datetime
-    from uuid import uuid4
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"session_{timestamp}_{uuid4().hex[:8]}"
+    # Same shape as before (local timestamp + 8 hex chars) without datetime/uuid
+    return f"session_{time.strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
 
 
 def _setup_observability(
     session_id: str,
     cfg: Config,
     verbose: bool,
+    logs_dir: Optional[Path] = None,
 ) -> Tuple[Path, MetricsCollector, "TrajectoryWriter", "LLMMessagesWriter"]:
     """
     Setup all observability components (logging, trajectory, metrics)
@@ -166,6 +203,7 @@ def _setup_observability(
         session_id: Session ID
         cfg: Configuration object
         verbose: Whether verbose logging is enabled
+        logs_dir: Pre-expanded base logs directory (defaults to cfg.logging.logs_dir)
         
     Returns:
         Tuple of (session_dir, metrics_collector, trajectory_writer, llm_messages_writer)
@@ -174,7 +212,7 @@ def _setup_observability(
     # This must be done early so loggers are available for subsequent operations
     session_dir = setup_logging(
         session_id=session_id,
-        logs_dir=cfg.logging.logs_dir,
+        logs_dir=logs_dir if logs_dir is not None else cfg.logging.logs_dir,
         workspace_path=os.getcwd(),
         verbose=verbose,
     )
@@ -182,6 +220,8 @@ def _setup_observability(
     # Initialize observability writers
     trajectory_writer = TrajectoryWriter(session_dir / "trajectory.jsonl")
     llm_messages_writer = LLMMessagesWriter(session_dir / "llm_messages.json")
+    register_writer(trajectory_writer)
+    register_writer(llm_messages_writer)
     
     # Initialize metrics collector for tracking performance
     metrics_collector = MetricsCollector(session_id=session_id)
@@ -189,13 +229,13 @@ def _setup_observability(
     return session_dir, metrics_collector, trajectory_writer, llm_messages_writer
 
 
-def _initialize_llm(
+def _build_llm_kwargs(
     cfg: Config,
     model_name: str,
     session_id: str,
-):
+) -> Dict[str, Any]:
     """
-    Initialize LLM instance
+    Build keyword arguments for create_llm from configuration
     
     Args:
         cfg: Configuration object
@@ -203,71 +243,82 @@ def _initialize_llm(
         session_id: Session ID for tracking
         
     Returns:
-        LLM instance
+        Keyword arguments for create_llm
     """
-    mainLogger.info("LLM initializing", model_name=model_name, enable_thinking=cfg.llm.enable_thinking)
-    
-    # Build kwargs, filtering out None values to avoid overriding factory defaults
-    llm_kwargs = {
+    # Only forward non-None values to avoid overriding factory defaults
+    opts = {k: v for k in _LLM_ATTRS if (v := getattr(cfg.llm, k)) is not None}
+    return {
         "model": model_name,
         "session_id": session_id,  # For Anthropic x-idealab-session-id header
+        **opts,
     }
+
+
+def _initialize_llm(llm_kwargs: Dict[str, Any], http_client: Optional[Any] = None):
+    """
+    Initialize LLM instance
+    
+    Args:
+        llm_kwargs: Keyword arguments from _build_llm_kwargs
+        http_client: Optional shared httpx.Client to reuse connections
+        
+    Returns:
+        LLM instance
+    """
+    mainLogger.info(
+        "LLM initializing",
+        model_name=llm_kwargs["model"],
+        enable_thinking=llm_kwargs.get("enable_thinking"),
+    )
+    if http_client is not None:
+        return create_llm(http_client=http_client, **llm_kwargs)
+    return create_llm(**llm_kwargs)
+
+
+def _load_resumed_session(
+    env_future: "Future[EnvironmentInfo]",
+    session_id: str,
+    logs_dir: Path,
+) -> Optional[List[Message]]:
+    """
+    Resume check run on the init pool once environment info is available
     
-    # Only add non-None values to avoid overriding factory defaults
-    if cfg.llm.provider is not None:
-        llm_kwargs["provider"] = cfg.llm.provider
-    if cfg.llm.api_key is not None:
-        llm_kwargs["api_key"] = cfg.llm.api_key
-    if cfg.llm.base_url is not None:
-        llm_kwargs["base_url"] = cfg.llm.base_url
-    if cfg.llm.temperature is not None:
-        llm_kwargs["temperature"] = cfg.llm.temperature
-    if cfg.llm.max_tokens is not None:
-        llm_kwargs["max_tokens"] = cfg.llm.max_tokens
-    if cfg.llm.timeout is not None:
-        llm_kwargs["timeout"] = cfg.llm.timeout
-    if cfg.llm.parallel_tool_calls is not None:
-        llm_kwargs["parallel_tool_calls"] = cfg.llm.parallel_tool_calls
-    if cfg.llm.enable_thinking is not None:
-        llm_kwargs["enable_thinking"] = cfg.llm.enable_thinking
-    if cfg.llm.top_k is not None:
-        llm_kwargs["top_k"] = cfg.llm.top_k
-    if cfg.llm.top_p is not None:
-        llm_kwargs["top_p"] = cfg.llm.top_p
-    
-    llm = create_llm(**llm_kwargs)
-    
-    return llm
+    Args:
+        env_future: Future resolving to the collected EnvironmentInfo
+        session_id: Session ID to resume
+        logs_dir: Base logs directory
+        
+    Returns:
+        List of Message objects if the session exists, None otherwise
+    """
+    return check_and_load_existing_session(
+        session_id=session_id,
+        workspace_path=env_future.result().cwd,
+        logs_dir=logs_dir,
+    )
 
 
 def _initialize_tools(
     cfg: Config,
     read_tracker: ReadTracker,
-    agent_profile: Any,
-) -> Tuple[Any, List[str]]:
+):
     """
-    Initialize tool registry and get available tools
+    Initialize tool registry
     
     Args:
         cfg: Configuration object
         read_tracker: Read tracker for file read tracking
-        agent_profile: Agent profile instance
         
     Returns:
-        Tuple of (tool_registry, available_tools)
+        ToolRegistry instance
     """
     # Initialize tool registry with workspace_root, read_tracker, and config
-    workspace_root = Path(cfg.agent_config.workspace_root).expanduser().resolve()
-    tool_registry = create_default_registry(
-        workspace_root=workspace_root,
+    return create_default_registry(
+        workspace_root=cfg.agent_config.workspace_root_resolved,
         read_tracker=read_tracker,
         config=cfg,
+        resolved=True,
     )
-    
-    # Get available tools based on agent profile
-    available_tools = agent_profile.get_tool_list(tool_registry.list_tool_names())
-    
-    return tool_registry, available_tools
 
 
 def _initialize_agent_loop(
@@ -307,140 +358,239 @@ def _initialize_agent_loop(
     return agent_loop
 
 
-def initialize_agent_components(
+def initialize_heavy_components(
     cfg: Config,
-    agent_name: str,
     verbose: bool,
-    agent_profile: Optional[Any] = None,
     session_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
-    Initialize all agent components (shared logic for headless and interactive modes)
+    Initialize the agent-independent components of a session
     
-    This function orchestrates the initialization of all major components:
-    - Agent profile and model selection
-    - Session and context management
-    - Observability (logging, metrics, trajectory)
-    - LLM and tools
-    - Agent execution loop
+    These are the expensive parts (environment probing, tool registry,
+    observability) that stay valid when the agent profile changes, so
+    callers can build them once and bind agents to them with bind_agent().
     
     Args:
         cfg: Configuration object
-        agent_name: Name of the agent profile to use (ignored if agent_profile is provided)
         verbose: Whether verbose logging is enabled
-        agent_profile: Optional pre-loaded AgentProfile (from --agent-file)
         session_id: Optional custom session ID (auto-generated if not provided)
         
     Returns:
-        Dictionary containing all initialized components:
-        - agent_manager: AgentProfileManager
-        - agent_profile: AgentProfile
+        Dictionary containing:
         - env_info: EnvironmentInfo
-        - context_engine: ContextEngine
-        - session_dir: Path to session directory
-        - llm: LLM instance
+        - read_tracker: ReadTracker
         - tool_registry: ToolRegistry
-        - agent_loop: AgentLoop
-        - available_tools: List of tool names
-        - model_name: Resolved model name
-        - config: Config instance
+        - session_id: Resolved session ID
+        - session_dir: Path to session directory
         - metrics_collector: MetricsCollector instance
+        - trajectory_writer: TrajectoryWriter instance
+        - llm_messages_writer: LLMMessagesWriter instance
         - resumed_conversation: List of resumed Message objects (None if new session)
+        - config: Config instance
     """
-    # 1. Initialize agent profile and determine model
-    agent_manager = AgentProfileManager()
-    agent_profile, model_name = _initialize_agent_profile(
-        agent_manager=agent_manager,
-        agent_name=agent_name,
-        agent_profile=agent_profile,
-        llm_model=cfg.llm.model,
-    )
+    # Expand the logs directory once and pass the concrete Path around
+    base_logs_dir = Path(cfg.logging.logs_dir).expanduser()
     
-    # 2. Collect environment info
-    env_info = EnvironmentInfo.collect()
-    
-    # 3. Determine session ID (use provided or generate new one)
+    # 1. Determine session ID (use provided or generate new one)
     actual_session_id = session_id or _generate_session_id()
     
-    # 4. Check if we should resume an existing session
-    resumed_conversation = None
-    if session_id:  # Only check for resume if session_id was explicitly provided
-        resumed_conversation = check_and_load_existing_session(
-            session_id=session_id,
-            workspace_path=env_info.cwd,
-            logs_dir=cfg.logging.logs_dir,
-        )
-    
-    # 5. Create ReadTracker (independent, no dependencies)
-    read_tracker = ReadTracker()
-    
-    # 6. Initialize tools (depends on read_tracker)
-    tool_registry, available_tools = _initialize_tools(
-        cfg=cfg,
-        read_tracker=read_tracker,
-        agent_profile=agent_profile,
-    )
+    # 2-4. Environment collection (git subprocesses) and the resume check
+    # (history file read) are I/O-bound and independent of tool setup,
+    # so they run on a small pool while the main thread continues
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="cfuse-init") as pool:
+        # 2. Collect environment info
+        env_future = pool.submit(EnvironmentInfo.collect)
+        
+        # 3. Check if we should resume an existing session (needs env_info.cwd)
+        resume_future = None
+        if session_id:  # Only check for resume if session_id was explicitly provided
+            resume_future = pool.submit(
+                _load_resumed_session,
+                env_future,
+                session_id,
+                base_logs_dir,
+            )
+        
+        # 4. Create ReadTracker and initialize tools (depends on read_tracker)
+        read_tracker = ReadTracker()
+        tool_registry = _initialize_tools(cfg=cfg, read_tracker=read_tracker)
+        
+        env_info = env_future.result()
+        resumed_conversation = resume_future.result() if resume_future else None
     
-    # 7. Setup observability (logging, trajectory, metrics)
+    # 5. Setup observability (logging, trajectory, metrics)
     session_dir, metrics_collector, trajectory_writer, llm_messages_writer = _setup_observability(
         session_id=actual_session_id,
         cfg=cfg,
         verbose=verbose,
+        logs_dir=base_logs_dir,
+    )
+    
+    return {
+        "env_info": env_info,
+        "read_tracker": read_tracker,
+        "tool_registry": tool_registry,
+        "session_id": actual_session_id,
+        "session_dir": session_dir,
+        "metrics_collector": metrics_collector,
+        "trajectory_writer": trajectory_writer,
+        "llm_messages_writer": llm_messages_writer,
+        "resumed_conversation": resumed_conversation,
+        "config": cfg,
+    }
+
+
+def bind_agent(
+    heavy: Dict[str, Any],
+    agent_name: str,
+    agent_profile: Optional[Any] = None,
+    agent_manager: Optional[AgentProfileManager] = None,
+) -> Dict[str, Any]:
+    """
+    Bind an agent profile to components from initialize_heavy_components()
+    
+    Creates the agent-specific parts (tool selection, ContextEngine, LLM and
+    AgentLoop) and writes the session start event for new sessions.
+    
+    Args:
+        heavy: Components returned by initialize_heavy_components()
+        agent_name: Name of the agent profile to use (ignored if agent_profile is provided)
+        agent_profile: Optional pre-loaded AgentProfile (from --agent-file)
+        agent_manager: Optional AgentProfileManager to reuse
+        
+    Returns:
+        Dictionary of all components (see initialize_agent_components)
+    """
+    cfg = heavy["config"]
+    tool_registry = heavy["tool_registry"]
+    session_id = heavy["session_id"]
+    
+    # 1. Initialize agent profile and determine model
+    if agent_manager is None:
+        agent_manager = AgentProfileManager()
+    agent_profile, model_name = _initialize_agent_profile(
+        agent_manager=agent_manager,
+        agent_name=agent_name,
+        agent_profile=agent_profile,
+        llm_model=cfg.llm.model,
     )
     
-    # 8. Create ContextEngine (depends on tool_registry, env_info, agent_profile)
+    # 2. Get available tools based on agent profile
+    available_tools = agent_profile.get_tool_list(tool_registry.list_tool_names())
+    
+    # 3. Create ContextEngine (depends on tool_registry, env_info, agent_profile)
     context_engine = ContextEngine(
-        environment=env_info,
+        environment=heavy["env_info"],
         tool_registry=tool_registry,
         agent_profile=agent_profile,
         max_tokens=cfg.agent_config.max_context_tokens,
-        session_id=actual_session_id,
-        workspace=env_info.cwd,
-        trajectory_writer=trajectory_writer,
-        llm_messages_writer=llm_messages_writer,
-        conversation_history=resumed_conversation,
+        session_id=session_id,
+        workspace=heavy["env_info"].cwd,
+        trajectory_writer=heavy["trajectory_writer"],
+        llm_messages_writer=heavy["llm_messages_writer"],
+        conversation_history=heavy["resumed_conversation"],
         available_tools=available_tools,
     )
     
-    # 9. Initialize LLM
-    llm = _initialize_llm(
-        cfg=cfg,
-        model_name=model_name,
-        session_id=actual_session_id,
+    # 4. Initialize LLM, reusing pooled connections to the same endpoint
+    llm_kwargs = _build_llm_kwargs(cfg, model_name, session_id)
+    http_client = get_client(
+        provider=llm_kwargs.get("provider", "openai_compatible"),
+        base_url=llm_kwargs.get("base_url"),
+        api_key=llm_kwargs.get("api_key", ""),
+        timeout=llm_kwargs.get("timeout", 60),
     )
+    llm = _initialize_llm(llm_kwargs, http_client=http_client)
     
-    # 10. Create agent loop
+    # 5. Create agent loop
     agent_loop = _initialize_agent_loop(
         llm=llm,
         tool_registry=tool_registry,
         context_engine=context_engine,
         cfg=cfg,
-        metrics_collector=metrics_collector,
+        metrics_collector=heavy["metrics_collector"],
     )
     
-    # 11. Write session start event
-    context_engine.write_session_start(
-        agent_name=agent_profile.name,
-        model=model_name,
-        tools=available_tools,
-        temperature=llm.temperature if hasattr(llm, 'temperature') else None,
-    )
+    # 6. Write session start event (a resumed session's trajectory already has one)
+    if heavy["resumed_conversation"] is None:
+        context_engine.write_session_start(
+            agent_name=agent_profile.name,
+            model=model_name,
+            tools=available_tools,
+            temperature=llm.temperature if hasattr(llm, 'temperature') else None,
+        )
     
     # Return all components
     return {
+        **heavy,
         "agent_manager": agent_manager,
         "agent_profile": agent_profile,
-        "env_info": env_info,
         "context_engine": context_engine,
-        "session_dir": session_dir,
         "llm": llm,
-        "tool_registry": tool_registry,
         "agent_loop": agent_loop,
         "available_tools": available_tools,
         "model_name": model_name,
-        "config": cfg,
-        "metrics_collector": metrics_collector,
-        "resumed_conversation": resumed_conversation,
-        "read_tracker": read_tracker,
     }
 
+
+def initialize_agent_components(
+    cfg: Config,
+    agent_name: str,
+    verbose: bool,
+    agent_profile: Optional[Any] = None,
+    session_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Initialize all agent components (shared logic for headless and interactive modes)
+    
+    Chains initialize_heavy_components() and bind_agent():
+    - Agent profile and model selection
+    - Session and context management
+    - Observability (logging, metrics, trajectory)
+    - LLM and tools
+    - Agent execution loop
+    
+    Args:
+        cfg: Configuration object
+        agent_name: Name of the agent profile to use (ignored if agent_profile is provided)
+        verbose: Whether verbose logging is enabled
+        agent_profile: Optional pre-loaded AgentProfile (from --agent-file)
+        session_id: Optional custom session ID (auto-generated if not provided)
+        
+    Returns:
+        Dictionary containing all initialized components:
+        - agent_manager: AgentProfileManager
+        - agent_profile: AgentProfile
+        - env_info: EnvironmentInfo
+        - context_engine: ContextEngine
+        - session_id: Resolved session ID
+        - session_dir: Path to session directory
+        - llm: LLM instance
+        - tool_registry: ToolRegistry
+        - agent_loop: AgentLoop
+        - available_tools: List of tool names
+        - model_name: Resolved model name
+        - config: Config instance
+        - metrics_collector: MetricsCollector instance
+        - trajectory_writer: TrajectoryWriter instance
+        - llm_messages_writer: LLMMessagesWriter instance
+        - resumed_conversation: List of resumed Message objects (None if new session)
+        - read_tracker: ReadTracker instance
+    """
+    # Resolve the agent profile first so an unknown agent fails before any
+    # session directory or log file is created
+    agent_manager = AgentProfileManager()
+    agent_profile, _ = _initialize_agent_profile(
+        agent_manager=agent_manager,
+        agent_name=agent_name,
+        agent_profile=agent_profile,
+        llm_model=cfg.llm.model,
+    )
+    
+    heavy = initialize_heavy_components(cfg, verbose, session_id=session_id)
+    return bind_agent(
+        heavy,
+        agent_name,
+        agent_profile=agent_profile,
+        agent_manager=agent_manager,
+    )
@@ -2,17 +2,24 @@
 Headless Mode - Single-prompt execution
 """
 
-import json
-from datetime import datetime
+import os
+import sys
 from typing import Dict, Any, List, Union
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
 
 from codefuse.llm.base import ContentBlock
 from codefuse.observability import mainLogger, close_all_loggers
 
-console = Console()
+# rich is imported on first print so runs that never render skip its import cost
+_console = None
+
+
+def _get_console():
+    """Get the shared rich Console, creating it on first use"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 
 def run_headless(
@@ -30,6 +37,16 @@ def run_headless(
         stream: Whether to stream LLM responses
         image_urls: Optional tuple of image URLs to include in the prompt
     """
+    # Pipes, CI and scripts get the raw text; rich is then never imported
+    use_rich = sys.stdout.isatty() and not os.environ.get("CODEFUSE_PLAIN")
+    
+    def _emit(text: str):
+        if use_rich:
+            _get_console().print(text)
+        else:
+            sys.stdout.write(text + "\n")
+            sys.stdout.flush()
+    
     # Unpack components
     agent_profile = components["agent_profile"]
     env_info = components["env_info"]
@@ -41,23 +58,19 @@ def run_headless(
     metrics_collector = components["metrics_collector"]
     context_engine = components["context_engine"]
     resumed_conversation = components["resumed_conversation"]
+    trajectory_writer = components["trajectory_writer"]
+    llm_messages_writer = components["llm_messages_writer"]
     
     # Build user query content (text + optional images)
     user_query: Union[str, List[ContentBlock]]
     if image_urls:
-        # Build multimodal content
+        # Build multimodal content (text block first, then images)
         content_blocks: List[ContentBlock] = []
-        
-        # Add text block
         if prompt:
             content_blocks.append(ContentBlock(type="text", text=prompt))
-        
-        # Add image blocks
-        for url in image_urls:
-            content_blocks.append(ContentBlock(
-                type="image_url",
-                image_url={"url": url}
-            ))
+        content_blocks.extend(
+            ContentBlock(type="image_url", image_url={"url": url}) for url in image_urls
+        )
         
         user_query = content_blocks
     else:
@@ -69,54 +82,52 @@ def run_headless(
     # Run agent loop
     mainLogger.info("Agent loop starting", session_id=context_engine.session_id)
     
-    final_response = ""
-    current_content = ""
-    current_tool_calls = []  # Track tool calls for the current response
-    iterations = 1
+    state: Dict[str, Any] = {
+        "final_response": "",
+        "current_content": "",
+        "iterations": 1,
+    }
+    
+    def _on_llm_done(data: Dict[str, Any]):
+        if not stream:
+            # Non-streaming: save content
+            content = data["content"]
+            if content:
+                state["current_content"] = content
+    
+    def _on_agent_done(data: Dict[str, Any]):
+        state["final_response"] = data["final_response"]
+        state["iterations"] = data["iterations"]
+        
+        trajectory_writer.flush()
+        llm_messages_writer.flush()
+        
+        # Only output the final response content
+        _emit(state["final_response"] or state["current_content"])
+    
+    def _on_error(data: Dict[str, Any]):
+        trajectory_writer.flush()
+        llm_messages_writer.flush()
+        if use_rich:
+            _get_console().print(f"[red]Error:[/red] {data['error']}")
+        else:
+            _emit(f"Error: {data['error']}")
+    
+    # tool_done needs no handling here: tool results are logged by
+    # tool_executor and assistant messages by agent_loop automatically
+    handlers = {
+        "llm_done": _on_llm_done,
+        "agent_done": _on_agent_done,
+        "error": _on_error,
+    }
     
     for event in agent_loop.run(
         user_query=user_query,
         stream=stream,
     ):
-        if event.type == "llm_done":
-            if not stream:
-                # Non-streaming: save content
-                content = event.data["content"]
-                if content:
-                    current_content = content
-            
-            # Check if there are tool calls in the response
-            if "tool_calls" in event.data and event.data["tool_calls"]:
-                current_tool_calls = event.data["tool_calls"]
-        
-        elif event.type == "tool_done":
-            tool_name = event.data["tool_name"]
-            tool_call_id = event.data.get("tool_call_id")
-            result = event.data["result"]
-            confirmed = event.data.get("confirmed", True)
-            
-                # Tool results are logged by tool_executor automatically
-        
-        elif event.type == "agent_done":
-            final_response = event.data["final_response"]
-            iterations = event.data["iterations"]
-            
-            # Save final assistant message to trajectory
-            assistant_message = {
-                "role": "assistant",
-                "content": final_response or current_content,
-                "timestamp": datetime.now().isoformat(),
-            }
-            if current_tool_calls:
-                assistant_message["tool_calls"] = current_tool_calls
-            # Assistant messages are logged by agent_loop automatically
-            
-            # Only output the final response content
-            console.print(final_response or current_content)
-        
-        elif event.type == "error":
-            error = event.data["error"]
-            console.print(f"[red]Error:[/red] {error}")
+        handler = handlers.get(event.type)
+        if handler is not None:
+            handler(event.data)
     
     # Generate and save metrics summary
     summary = metrics_collector.generate_summary()
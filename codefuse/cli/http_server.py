@@ -9,28 +9,52 @@ Features:
 - Log-based metrics endpoint
 - Health check endpoint
 - Graceful shutdown support
+- Sampled tracebacks for unexpected errors (CFUSE_TRACEBACK_SAMPLE, default 0.01)
 
 Error Handling Strategy:
 - 400: Only for basic parameter parsing errors (invalid JSON, missing required fields)
 - 200 with success=false: All other errors (tool not found, workspace doesn't exist, execution failures)
 """
 
-import json
+import atexit
+import hashlib
+import io
+import logging
+import mmap
+import multiprocessing
 import os
+import random
 import sys
+import threading
 import time
+import traceback
 import uuid
-from collections import defaultdict
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Iterator, Optional, List, Sequence, Tuple
 
-from flask import Flask, request, jsonify, Response
-from werkzeug.exceptions import BadRequest
+from flask import Flask, request, jsonify, render_template, Response
+from flask.json.provider import DefaultJSONProvider
 from rich.console import Console
 
+try:
+    import gunicorn.app.base
+except ImportError:
+    gunicorn = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from codefuse import _json
 from codefuse.config import Config
-from codefuse.tools.registry import create_default_registry
+from codefuse.tools.registry import create_bash_tool, create_default_registry
 from codefuse.observability import mainLogger
 from codefuse.observability.http_logger import HTTPLogger, create_http_logger
 
@@ -40,15 +64,71 @@ console = Console()
 _global_config: Optional[Config] = None
 _http_logger: Optional[HTTPLogger] = None
 
+# Fraction of unexpected errors logged with a formatted traceback; formatting
+# walks every frame, which adds up during an error storm
+_TRACEBACK_SAMPLE = float(os.getenv("CFUSE_TRACEBACK_SAMPLE", "0.01"))
+
+# Tool registries per resolved workspace path, built once per workspace per
+# worker. Only stateless tools are cached: BashTool keeps a persistent shell
+# (cwd, exported variables), so each request gets a fresh one instead and
+# state never leaks between clients.
+_REGISTRY_CACHE_SIZE = 128
+_registry_cache: "OrderedDict[str, Any]" = OrderedDict()
+_registry_cache_lock = threading.Lock()
+_BASH_TOOL_NAME = "bash"
+
+# Resolved workdirs (workdir -> (expiry in monotonic ns, path)). Only existing
+# directories are cached, so a workspace created after a failed request is
+# picked up immediately.
+_WORKDIR_CACHE_TTL_NS = 60 * 1_000_000_000
+_WORKDIR_CACHE_SIZE = 256
+_workdir_cache: Dict[str, Tuple[int, Path]] = {}
+
+
+def _sample_traceback() -> bool:
+    """Whether the current error should be logged with its traceback"""
+    return random.random() < _TRACEBACK_SAMPLE
+
+
+class _FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by codefuse._json (orjson when installed)
+    
+    Responses are serialized straight to bytes. Objects the fast path cannot
+    encode, and calls with explicit json.dumps options, fall back to Flask's
+    default provider.
+    """
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not kwargs:
+            try:
+                return _json.dumps(obj).decode("utf-8")
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return _json.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = _json.dumps(obj)
+        except TypeError:
+            body = super().dumps(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 
 def create_app() -> Flask:
     """Create and configure Flask application"""
     # Set template folder to codefuse/cli/templates
     template_dir = Path(__file__).parent / "templates"
     app = Flask(__name__, template_folder=str(template_dir))
+    app.json = _FastJSONProvider(app)
     
     # Disable Flask's default logger in favor of structlog
-    import logging
     log = logging.getLogger('werkzeug')
     log.setLevel(logging.ERROR)
     
@@ -56,12 +136,12 @@ def create_app() -> Flask:
     def before_request():
         """Add request ID and start time to request context"""
         request.request_id = str(uuid.uuid4())
-        request.start_time = time.time()
+        request.start_time_ns = time.monotonic_ns()
     
     @app.after_request
     def after_request(response: Response) -> Response:
         """Log request completion to file"""
-        duration = time.time() - request.start_time
+        duration = (time.monotonic_ns() - request.start_time_ns) * 1e-9
         
         # Extract tool info from request context if available
         tool_name = getattr(request, 'tool_name', None)
@@ -107,9 +187,8 @@ def create_app() -> Flask:
             # Return empty response, but it won't reach client anyway
             return '', 500
         
-        # Log unexpected errors
-        import traceback
-        error_traceback = traceback.format_exc()
+        # Log unexpected errors (traceback only for a sample of them)
+        error_traceback = traceback.format_exc() if _sample_traceback() else None
         
         if _http_logger:
             _http_logger.log_error(
@@ -153,11 +232,17 @@ def create_app() -> Flask:
             days = request.args.get('days', default=2, type=int)
             days = max(1, min(days, 30))  # Limit to 1-30 days
             
+            etag = _dashboard_etag(days)
+            if etag is not None and etag in request.if_none_match:
+                return _not_modified(etag)
+            
             metrics_data = _compute_dashboard_metrics(days=days)
-            return jsonify(metrics_data), 200
+            response = jsonify(metrics_data)
+            if etag is not None:
+                response.set_etag(etag)
+            return response, 200
         except Exception as e:
             console.print(f"[red]Error computing dashboard metrics:[/red] {e}")
-            import traceback
             traceback.print_exc()
             return jsonify({
                 "error": f"Failed to compute metrics: {str(e)}"
@@ -167,8 +252,6 @@ def create_app() -> Flask:
     def dashboard():
         """Dashboard endpoint - HTML visualization"""
         try:
-            from flask import render_template
-            
             # Debug: print template folder info
             template_dir = Path(__file__).parent / "templates"
             template_file = template_dir / "dashboard.html"
@@ -187,7 +270,6 @@ def create_app() -> Flask:
             
             return render_template('dashboard.html')
         except Exception as e:
-            import traceback
             error_trace = traceback.format_exc()
             
             mainLogger.error(
@@ -217,8 +299,8 @@ def create_app() -> Flask:
         try:
             # Parse request body
             try:
-                request_data = request.get_json(force=True)
-            except BadRequest as e:
+                request_data = _json.loads(request.get_data(cache=False))
+            except (_json.JSONDecodeError, UnicodeDecodeError) as e:
                 mainLogger.warning(
                     "Invalid JSON in request",
                     request_id=request.request_id,
@@ -281,7 +363,7 @@ def create_app() -> Flask:
                 "Tool execution request failed",
                 request_id=request.request_id,
                 error=str(e),
-                exc_info=True
+                exc_info=_sample_traceback()
             )
             return jsonify({
                 "success": False,
@@ -291,6 +373,72 @@ def create_app() -> Flask:
     return app
 
 
+def _resolve_workdir(workdir: str) -> Optional[Path]:
+    """
+    Resolve a request workdir, reusing the result for up to a minute
+    
+    Args:
+        workdir: Workspace directory as sent by the client
+    
+    Returns:
+        Resolved path, or None if it does not exist
+    """
+    now = time.monotonic_ns()
+    cached = _workdir_cache.get(workdir)
+    if cached is not None and now < cached[0]:
+        return cached[1]
+    
+    workspace_path = Path(workdir).expanduser().resolve()
+    if not workspace_path.exists():
+        _workdir_cache.pop(workdir, None)
+        return None
+    
+    if len(_workdir_cache) >= _WORKDIR_CACHE_SIZE:
+        _workdir_cache.clear()
+    _workdir_cache[workdir] = (now + _WORKDIR_CACHE_TTL_NS, workspace_path)
+    return workspace_path
+
+
+def _get_registry(workspace_path: Path) -> Any:
+    """
+    Get the cached registry of stateless tools for a workspace, building it
+    on first use
+    
+    Args:
+        workspace_path: Resolved workspace directory
+    
+    Returns:
+        Tool registry without BashTool
+    """
+    key = str(workspace_path)
+    tool_registry = _registry_cache.get(key)
+    if tool_registry is not None:
+        return tool_registry
+    
+    with _registry_cache_lock:
+        tool_registry = _registry_cache.get(key)
+        if tool_registry is None:
+            tool_registry = create_default_registry(
+                workspace_root=workspace_path,
+                read_tracker=None,
+                config=_global_config,
+                resolved=True,
+                include_bash=False,
+            )
+            _registry_cache[key] = tool_registry
+            if len(_registry_cache) > _REGISTRY_CACHE_SIZE:
+                _registry_cache.popitem(last=False)
+    return tool_registry
+
+# Per-file aggregates for the metrics endpoints, kept in worker memory and
+# advanced by parsing only the bytes appended since the previous call:
+# path -> [inode, offset, stats]
+_metrics_file_cache: Dict[Path, List[Any]] = {}
+_metrics_cache_lock = threading.Lock()
+_dashboard_file_cache: Dict[Path, List[Any]] = {}
+_dashboard_cache_lock = threading.Lock()
+
+
 def _execute_tool(
     workdir: str,
     tool_name: str,
@@ -302,13 +450,13 @@ def _execute_tool(
     Returns:
         Dictionary with 'status_code' and 'data' keys
     """
-    start_time = time.time()
+    start_time_ns = time.monotonic_ns()
     success = False
     
     try:
         # Resolve workspace path
-        workspace_path = Path(workdir).expanduser().resolve()
-        if not workspace_path.exists():
+        workspace_path = _resolve_workdir(workdir)
+        if workspace_path is None:
             return {
                 "status_code": 200,
                 "data": {
@@ -321,17 +469,16 @@ def _execute_tool(
                 }
             }
         
-        # Initialize tool registry
-        tool_registry = create_default_registry(
-            workspace_root=workspace_path,
-            read_tracker=None,
-            config=_global_config,
-        )
+        # Get (cached) tool registry for this workspace
+        tool_registry = _get_registry(workspace_path)
         
         # Check if tool exists
-        tool = tool_registry.get_tool(tool_name)
+        if tool_name == _BASH_TOOL_NAME:
+            tool = create_bash_tool(workspace_path, _global_config)
+        else:
+            tool = tool_registry.get_tool(tool_name)
         if tool is None:
-            available_tools = tool_registry.list_tool_names()
+            available_tools = [*tool_registry.list_tool_names(), _BASH_TOOL_NAME]
             return {
                 "status_code": 200,
                 "data": {
@@ -346,7 +493,13 @@ def _execute_tool(
             }
         
         # Execute the tool
-        tool_result = tool.execute(**tool_args)
+        if tool_name == _BASH_TOOL_NAME:
+            try:
+                tool_result = tool.execute(**tool_args)
+            finally:
+                tool.cleanup()
+        else:
+            tool_result = tool.execute(**tool_args)
         
         # Handle both ToolResult and string returns
         if isinstance(tool_result, str):
@@ -398,6 +551,164 @@ def _execute_tool(
         }
 
 
+def _iter_new_entries(buf: Any, state: List[Any], base: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield JSON entries from complete lines past the saved offset
+    
+    Lines are located with bytes-level newline searches and handed to the
+    JSON parser as bytes, without text decoding. Advances state[1] as lines
+    are consumed. A trailing line without a newline is still being written
+    and is left for the next call.
+    
+    Args:
+        buf: File contents starting at byte `base` (mmap or bytes)
+        state: Per-file cache entry ([inode, offset, stats])
+        base: File offset of buf[0]
+    """
+    pos = state[1] - base
+    while True:
+        newline = buf.find(b'\n', pos)
+        if newline < 0:
+            break
+        line = buf[pos:newline]
+        pos = newline + 1
+        state[1] = base + pos
+        try:
+            yield _json.loads(line)
+        except _json.JSONDecodeError:
+            continue
+
+
+def _tail_log_file(
+    cache: Dict[Path, List[Any]],
+    log_file: Path,
+    new_stats: Callable[[], Any],
+    fold: Callable[[Any, Iterator[Dict[str, Any]]], None],
+) -> Optional[Any]:
+    """
+    Bring one file's cached aggregates up to date and return them
+    
+    Only bytes appended since the previous call are parsed. The aggregates
+    are rebuilt from the start when the file was replaced (inode change) or
+    truncated. Totals still come from the shared log files, which keeps them
+    consistent across Gunicorn workers.
+    
+    Args:
+        cache: Per-file cache (path -> [inode, offset, stats])
+        log_file: Path to a daily JSON access log
+        new_stats: Factory for empty aggregates
+        fold: Folds an iterator of new entries into the aggregates
+    
+    Returns:
+        Aggregates for the file, or None if it does not exist
+    """
+    try:
+        st = os.stat(log_file)
+    except FileNotFoundError:
+        cache.pop(log_file, None)
+        return None
+    
+    state = cache.get(log_file)
+    if state is None or state[0] != st.st_ino or st.st_size < state[1]:
+        state = [st.st_ino, 0, new_stats()]
+        cache[log_file] = state
+    
+    if st.st_size > state[1]:
+        try:
+            with open(log_file, 'rb') as f:
+                try:
+                    mm = mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    # File changed under us or cannot be mapped: read the new bytes instead
+                    f.seek(state[1])
+                    fold(state[2], _iter_new_entries(f.read(), state, base=state[1]))
+                else:
+                    with mm:
+                        fold(state[2], _iter_new_entries(mm, state))
+        except Exception as e:
+            console.print(f"[yellow]Warning:[/yellow] Failed to read {log_file.name}: {e}")
+    
+    return state[2]
+
+
+def _has_new_bytes(cache: Dict[Path, List[Any]], log_file: Path) -> bool:
+    """Whether a log file changed since its aggregates were cached"""
+    try:
+        st = os.stat(log_file)
+    except FileNotFoundError:
+        return False
+    state = cache.get(log_file)
+    return state is None or state[0] != st.st_ino or st.st_size != state[1]
+
+
+def _tail_log_files(
+    cache: Dict[Path, List[Any]],
+    log_files: List[Path],
+    new_stats: Callable[[], Any],
+    fold: Callable[[Any, Iterator[Dict[str, Any]]], None],
+) -> List[Optional[Any]]:
+    """
+    Bring several files' cached aggregates up to date (see _tail_log_file)
+    
+    Files with unread bytes are parsed in parallel threads first, which
+    overlaps their disk reads on a cold cache (e.g. a 30-day dashboard query
+    after startup). Each thread only touches its own file's cache entry.
+    
+    Returns:
+        Aggregates per file, in the order of log_files
+    """
+    pending = [log_file for log_file in log_files if _has_new_bytes(cache, log_file)]
+    if len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(pending), 8)) as pool:
+            for _ in pool.map(lambda log_file: _tail_log_file(cache, log_file, new_stats, fold), pending):
+                pass
+    return [_tail_log_file(cache, log_file, new_stats, fold) for log_file in log_files]
+
+
+def _recent_log_files(days: int) -> List[Path]:
+    """JSON log paths for the last `days` days, newest first"""
+    now = datetime.now()
+    return [_http_logger._get_json_log_path(now - timedelta(days=i)) for i in range(days)]
+
+
+def _new_metrics_stats() -> Dict[str, Any]:
+    """Empty per-file aggregates for /metrics"""
+    return {
+        "http_requests_total": defaultdict(int),  # (method, path, status) -> count
+        "tool_executions_total": defaultdict(int),  # (tool_name, status) -> count
+        "request_durations": array('d'),  # All request durations
+        "tool_durations": defaultdict(lambda: array('d')),  # tool_name -> durations
+    }
+
+
+def _fold_metrics_entries(stats: Dict[str, Any], entries: Iterator[Dict[str, Any]]) -> None:
+    """Fold log entries into /metrics aggregates"""
+    http_requests = stats["http_requests_total"]
+    tool_executions = stats["tool_executions_total"]
+    add_request_duration = stats["request_durations"].append
+    tool_durations = stats["tool_durations"]
+    
+    for entry in entries:
+        entry_get = entry.get
+        
+        # HTTP request metrics
+        method = entry_get('method', 'UNKNOWN')
+        path = entry_get('path', 'UNKNOWN')
+        status = entry_get('status', 0)
+        duration = entry_get('duration', 0)
+        
+        http_requests[(method, path, status)] += 1
+        add_request_duration(duration)
+        
+        # Tool execution metrics
+        tool_name = entry_get('tool_name')
+        if tool_name:
+            success = entry_get('success', False)
+            status_label = 'success' if success else 'error'
+            tool_executions[(tool_name, status_label)] += 1
+            tool_durations[tool_name].append(duration)
+
+
 def _compute_metrics_from_logs(days: int = 2) -> Dict[str, Any]:
     """
     Compute metrics by parsing JSON log files
@@ -416,59 +727,188 @@ def _compute_metrics_from_logs(days: int = 2) -> Dict[str, Any]:
             "tool_durations": {},
         }
     
-    log_dir = _http_logger.log_dir
-    
     # Collect stats
     http_requests = defaultdict(int)  # (method, path, status) -> count
     tool_executions = defaultdict(int)  # (tool_name, status) -> count
-    request_durations = []  # All request durations
-    tool_durations = defaultdict(list)  # tool_name -> [durations]
+    request_durations = array('d')  # All request durations
+    tool_durations = defaultdict(lambda: array('d'))  # tool_name -> durations
     
-    # Parse logs from recent days
-    for i in range(days):
-        date = datetime.now() - timedelta(days=i)
-        log_file = _http_logger._get_json_log_path(date)
-        
-        if not log_file.exists():
-            continue
-        
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
-                        
-                        # HTTP request metrics
-                        method = entry.get('method', 'UNKNOWN')
-                        path = entry.get('path', 'UNKNOWN')
-                        status = entry.get('status', 0)
-                        duration = entry.get('duration', 0)
-                        
-                        http_requests[(method, path, status)] += 1
-                        request_durations.append(duration)
-                        
-                        # Tool execution metrics
-                        tool_name = entry.get('tool_name')
-                        if tool_name:
-                            success = entry.get('success', False)
-                            status_label = 'success' if success else 'error'
-                            tool_executions[(tool_name, status_label)] += 1
-                            tool_durations[tool_name].append(duration)
-                    
-                    except json.JSONDecodeError:
-                        continue
+    # Merge per-file stats from recent days
+    log_files = _recent_log_files(days)
+    
+    with _metrics_cache_lock:
+        # Forget files that fell out of the window
+        for stale in [f for f in _metrics_file_cache if f not in log_files]:
+            del _metrics_file_cache[stale]
         
-        except Exception as e:
-            console.print(f"[yellow]Warning:[/yellow] Failed to read {log_file.name}: {e}")
+        for stats in _tail_log_files(_metrics_file_cache, log_files, _new_metrics_stats, _fold_metrics_entries):
+            if stats is None:
+                continue
+            for key, count in stats["http_requests_total"].items():
+                http_requests[key] += count
+            for key, count in stats["tool_executions_total"].items():
+                tool_executions[key] += count
+            request_durations.extend(stats["request_durations"])
+            for tool_name, durations in stats["tool_durations"].items():
+                tool_durations[tool_name].extend(durations)
     
     return {
         "http_requests_total": dict(http_requests),
         "tool_executions_total": dict(tool_executions),
         "request_durations": request_durations,
-        "tool_durations": {k: list(v) for k, v in tool_durations.items()},
+        "tool_durations": dict(tool_durations),
     }
 
 
+def _select_ranks(values: Sequence[float], ranks: List[int]) -> List[float]:
+    """
+    Get the values at the given positions of the sorted values
+    
+    With numpy this is an O(N) partial sort (introselect); otherwise the
+    values are sorted. Results are identical either way.
+    
+    Args:
+        values: Non-empty sequence of numbers (e.g. array('d'))
+        ranks: Indices into the sorted order
+    
+    Returns:
+        The value at each requested rank
+    """
+    if np is not None:
+        selected = np.partition(np.asarray(values, dtype=np.float64), ranks)
+        return [float(selected[r]) for r in ranks]
+    sorted_values = sorted(values)
+    return [sorted_values[r] for r in ranks]
+
+
+def _minute_key(timestamp_str: Any) -> Optional[str]:
+    """
+    Minute bucket ('YYYY-MM-DD HH:MM') of an ISO-8601 log timestamp
+    
+    Timestamps written by HTTPLogger are sliced directly; anything else is
+    parsed, and None is returned when it is not a valid timestamp.
+    """
+    if not timestamp_str:
+        return None
+    if (
+        len(timestamp_str) >= 16
+        and timestamp_str[10] in 'T '
+        and timestamp_str[4] == '-' and timestamp_str[7] == '-' and timestamp_str[13] == ':'
+        and timestamp_str[:4].isdigit() and timestamp_str[11:13].isdigit() and timestamp_str[14:16].isdigit()
+    ):
+        return f"{timestamp_str[:10]} {timestamp_str[11:16]}"
+    try:
+        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+    except Exception:
+        return None
+    return dt.strftime('%Y-%m-%d %H:%M')
+
+
+def _new_dashboard_stats() -> Dict[str, Any]:
+    """Empty per-file aggregates for /api/metrics"""
+    return {
+        # Tool calls per minute, as parallel counters keyed by minute
+        "timeline_total": Counter(),
+        "timeline_success": Counter(),
+        "timeline_failed": Counter(),
+        "by_status": defaultdict(int),
+        "by_endpoint": defaultdict(int),
+        "by_tool": defaultdict(lambda: {"total": 0, "success": 0, "failed": 0, "durations": array('d')}),
+        "request_durations": array('d'),
+        "errors": [],
+    }
+
+
+def _fold_dashboard_entries(stats: Dict[str, Any], entries: Iterator[Dict[str, Any]]) -> None:
+    """Fold log entries into /api/metrics aggregates (tool calls only)"""
+    timeline_total = stats["timeline_total"]
+    timeline_success = stats["timeline_success"]
+    timeline_failed = stats["timeline_failed"]
+    http_by_status = stats["by_status"]
+    http_by_endpoint = stats["by_endpoint"]
+    tool_by_name = stats["by_tool"]
+    add_request_duration = stats["request_durations"].append
+    add_error = stats["errors"].append
+    
+    for entry in entries:
+        entry_get = entry.get
+        
+        # Only process entries with tool_name (actual tool calls)
+        tool_name = entry_get('tool_name')
+        if not tool_name:
+            continue
+        
+        # HTTP request metrics (only for tool calls)
+        status = entry_get('status', 0)
+        path = entry_get('path', 'UNKNOWN')
+        duration = entry_get('duration', 0)
+        timestamp = entry_get('timestamp')
+        
+        http_by_status[status] += 1
+        http_by_endpoint[path] += 1
+        add_request_duration(duration)
+        
+        # Tool execution metrics
+        success = entry_get('success', False)
+        tool_stats = tool_by_name[tool_name]
+        tool_stats["total"] += 1
+        if success:
+            tool_stats["success"] += 1
+        else:
+            tool_stats["failed"] += 1
+        tool_stats["durations"].append(duration)
+        
+        # Collect errors
+        if not success:
+            error_msg = entry_get('error', 'Unknown error')
+            add_error({
+                "timestamp": timestamp,
+                "tool_name": tool_name,
+                "error": error_msg[:100],  # Truncate long errors
+            })
+        
+        # Timeline (group by minute)
+        minute_key = _minute_key(timestamp)
+        if minute_key:
+            timeline_total[minute_key] += 1
+            (timeline_success if status == 200 else timeline_failed)[minute_key] += 1
+
+
+def _etag(parts: Any) -> str:
+    """Short entity tag for a tuple of ints/strings (same value in every worker)"""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+
+
+def _not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current entity tag"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def _dashboard_etag(days: int = 2) -> Optional[str]:
+    """
+    Entity tag for /api/metrics, derived from the number of tool calls per file
+    
+    The dashboard only counts tool calls, so other requests (including its
+    own polling) leave the tag unchanged. The tag needs the per-file
+    aggregates brought up to date (parsing only newly appended lines), so a
+    304 does not skip the tail itself: it saves merging the files, the
+    percentile and histogram computation and the JSON encoding.
+    """
+    if not _http_logger:
+        return None
+    log_files = _recent_log_files(days)
+    with _dashboard_cache_lock:
+        all_stats = _tail_log_files(_dashboard_file_cache, log_files, _new_dashboard_stats, _fold_dashboard_entries)
+        parts = tuple(
+            (log_file.name, _dashboard_file_cache[log_file][0], sum(stats["by_status"].values()))
+            for log_file, stats in zip(log_files, all_stats)
+            if stats is not None
+        )
+    return _etag((days, parts))
+
+
 def _compute_dashboard_metrics(days: int = 2) -> Dict[str, Any]:
     """
     Compute detailed metrics for dashboard visualization
@@ -504,70 +944,43 @@ def _compute_dashboard_metrics(days: int = 2) -> Dict[str, Any]:
             "errors": [],
         }
     
-    log_dir = _http_logger.log_dir
-    
     # Collect detailed stats - ONLY for tool calls
-    all_tool_entries = []  # Only entries with tool_name
+    timeline_total = Counter()
+    timeline_success = Counter()
+    timeline_failed = Counter()
     http_by_status = defaultdict(int)
     http_by_endpoint = defaultdict(int)
-    tool_by_name = defaultdict(lambda: {"total": 0, "success": 0, "failed": 0, "durations": []})
-    request_durations = []
+    tool_by_name = defaultdict(lambda: {"total": 0, "success": 0, "failed": 0, "durations": array('d')})
+    request_durations = array('d')
     errors = []
     
-    # Parse logs from recent days
-    for i in range(days):
-        date = datetime.now() - timedelta(days=i)
-        log_file = _http_logger._get_json_log_path(date)
-        
-        if not log_file.exists():
-            continue
-        
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
-                        
-                        # Only process entries with tool_name (actual tool calls)
-                        tool_name = entry.get('tool_name')
-                        if not tool_name:
-                            continue
-                        
-                        # This is a tool call, add it to our stats
-                        all_tool_entries.append(entry)
-                        
-                        # HTTP request metrics (only for tool calls)
-                        status = entry.get('status', 0)
-                        path = entry.get('path', 'UNKNOWN')
-                        duration = entry.get('duration', 0)
-                        
-                        http_by_status[status] += 1
-                        http_by_endpoint[path] += 1
-                        request_durations.append(duration)
-                        
-                        # Tool execution metrics
-                        success = entry.get('success', False)
-                        tool_by_name[tool_name]["total"] += 1
-                        if success:
-                            tool_by_name[tool_name]["success"] += 1
-                        else:
-                            tool_by_name[tool_name]["failed"] += 1
-                        tool_by_name[tool_name]["durations"].append(duration)
-                        
-                        # Collect errors
-                        if not success:
-                            error_msg = entry.get('error', 'Unknown error')
-                            errors.append({
-                                "timestamp": entry.get('timestamp'),
-                                "tool_name": tool_name,
-                                "error": error_msg[:100],  # Truncate long errors
-                            })
-                    
-                    except json.JSONDecodeError:
-                        continue
+    # Merge per-file stats from recent days
+    log_files = _recent_log_files(days)
+    
+    with _dashboard_cache_lock:
+        # Forget files older than the widest window the endpoint accepts
+        keep = set(_recent_log_files(30))
+        for stale in [f for f in _dashboard_file_cache if f not in keep]:
+            del _dashboard_file_cache[stale]
         
-        except Exception as e:
-            console.print(f"[yellow]Warning:[/yellow] Failed to read {log_file.name}: {e}")
+        for stats in _tail_log_files(_dashboard_file_cache, log_files, _new_dashboard_stats, _fold_dashboard_entries):
+            if stats is None:
+                continue
+            timeline_total.update(stats["timeline_total"])
+            timeline_success.update(stats["timeline_success"])
+            timeline_failed.update(stats["timeline_failed"])
+            for status, count in stats["by_status"].items():
+                http_by_status[status] += count
+            for path, count in stats["by_endpoint"].items():
+                http_by_endpoint[path] += count
+            for tool_name, tool_stats in stats["by_tool"].items():
+                merged = tool_by_name[tool_name]
+                merged["total"] += tool_stats["total"]
+                merged["success"] += tool_stats["success"]
+                merged["failed"] += tool_stats["failed"]
+                merged["durations"].extend(tool_stats["durations"])
+            request_durations.extend(stats["request_durations"])
+            errors.extend(stats["errors"])
     
     # Compute overview metrics
     total_requests = sum(http_by_status.values())
@@ -581,28 +994,34 @@ def _compute_dashboard_metrics(days: int = 2) -> Dict[str, Any]:
     avg_response_time = (sum(request_durations) / len(request_durations)) if request_durations else 0
     
     # Compute percentiles
-    sorted_durations = sorted(request_durations)
     percentiles = {}
-    if sorted_durations:
-        count = len(sorted_durations)
+    if request_durations:
+        count = len(request_durations)
+        p50, p95, p99, min_duration, max_duration = _select_ranks(
+            request_durations,
+            [int(count * 0.5), int(count * 0.95), int(count * 0.99), 0, count - 1],
+        )
         percentiles = {
-            "p50": sorted_durations[int(count * 0.5)],
-            "p95": sorted_durations[int(count * 0.95)],
-            "p99": sorted_durations[int(count * 0.99)],
-            "min": sorted_durations[0],
-            "max": sorted_durations[-1],
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "min": min_duration,
+            "max": max_duration,
         }
     
     # Create duration histogram (bins: 0-0.1s, 0.1-0.5s, 0.5-1s, 1-2s, 2-5s, 5s+)
-    histogram_bins = [0, 0.1, 0.5, 1, 2, 5, float('inf')]
+    # Bucket i holds edges[i-1] <= duration < edges[i]
+    histogram_edges = [0.1, 0.5, 1, 2, 5]
     histogram_labels = ["<100ms", "100ms-500ms", "500ms-1s", "1s-2s", "2s-5s", ">5s"]
-    histogram_counts = [0] * len(histogram_labels)
-    
-    for duration in request_durations:
-        for i in range(len(histogram_bins) - 1):
-            if histogram_bins[i] <= duration < histogram_bins[i + 1]:
-                histogram_counts[i] += 1
-                break
+    if np is not None and request_durations:
+        bucket_indices = np.searchsorted(
+            histogram_edges, np.frombuffer(request_durations, dtype=np.float64), side='right'
+        )
+        histogram_counts = np.bincount(bucket_indices, minlength=len(histogram_labels)).tolist()
+    else:
+        histogram_counts = [0] * len(histogram_labels)
+        for duration in request_durations:
+            histogram_counts[bisect_right(histogram_edges, duration)] += 1
     
     duration_histogram = [
         {"label": label, "count": count}
@@ -620,28 +1039,16 @@ def _compute_dashboard_metrics(days: int = 2) -> Dict[str, Any]:
         durations = stats["durations"]
         avg_duration_by_tool[tool_name] = (sum(durations) / len(durations)) if durations else 0
     
-    # Create timeline (group by minute) - only for tool calls
-    timeline = defaultdict(lambda: {"timestamp": "", "total": 0, "success": 0, "failed": 0})
-    for entry in all_tool_entries:
-        timestamp_str = entry.get('timestamp', '')
-        if timestamp_str:
-            try:
-                dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                # Group by minute
-                minute_key = dt.strftime('%Y-%m-%d %H:%M')
-                timeline[minute_key]["timestamp"] = minute_key
-                timeline[minute_key]["total"] += 1
-                
-                status = entry.get('status', 0)
-                if status == 200:
-                    timeline[minute_key]["success"] += 1
-                else:
-                    timeline[minute_key]["failed"] += 1
-            except:
-                pass
-    
     # Sort timeline by timestamp
-    timeline_data = sorted(timeline.values(), key=lambda x: x["timestamp"])
+    timeline_data = [
+        {
+            "timestamp": minute_key,
+            "total": timeline_total[minute_key],
+            "success": timeline_success[minute_key],
+            "failed": timeline_failed[minute_key],
+        }
+        for minute_key in sorted(timeline_total)
+    ]
     
     return {
         "overview": {
@@ -680,71 +1087,137 @@ def _compute_dashboard_metrics(days: int = 2) -> Dict[str, Any]:
 
 def _format_prometheus_metrics(stats: Dict[str, Any]) -> str:
     """Format metrics as Prometheus text format"""
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
     
     # HTTP requests total
-    lines.append("# HELP http_requests_total Total HTTP requests")
-    lines.append("# TYPE http_requests_total counter")
-    for (method, path, status), count in stats["http_requests_total"].items():
-        lines.append(f'http_requests_total{{method="{method}",endpoint="{path}",status="{status}"}} {count}')
+    w("# HELP http_requests_total Total HTTP requests\n"
+      "# TYPE http_requests_total counter\n")
+    w("".join(
+        f'http_requests_total{{method="{method}",endpoint="{path}",status="{status}"}} {count}\n'
+        for (method, path, status), count in stats["http_requests_total"].items()
+    ))
     
     # Tool executions total
-    lines.append("")
-    lines.append("# HELP tool_executions_total Total tool executions")
-    lines.append("# TYPE tool_executions_total counter")
-    for (tool_name, status), count in stats["tool_executions_total"].items():
-        lines.append(f'tool_executions_total{{tool_name="{tool_name}",status="{status}"}} {count}')
+    w("\n# HELP tool_executions_total Total tool executions\n"
+      "# TYPE tool_executions_total counter\n")
+    w("".join(
+        f'tool_executions_total{{tool_name="{tool_name}",status="{status}"}} {count}\n'
+        for (tool_name, status), count in stats["tool_executions_total"].items()
+    ))
     
     # Request duration percentiles
-    durations = sorted(stats["request_durations"])
+    durations = stats["request_durations"]
     if durations:
-        lines.append("")
-        lines.append("# HELP http_request_duration_seconds HTTP request duration in seconds")
-        lines.append("# TYPE http_request_duration_seconds summary")
-        
         # Calculate percentiles
         count = len(durations)
         total = sum(durations)
-        p50 = durations[int(count * 0.5)] if count > 0 else 0
-        p95 = durations[int(count * 0.95)] if count > 0 else 0
-        p99 = durations[int(count * 0.99)] if count > 0 else 0
+        p50, p95, p99 = _select_ranks(
+            durations, [int(count * 0.5), int(count * 0.95), int(count * 0.99)]
+        )
         
-        lines.append(f'http_request_duration_seconds{{quantile="0.5"}} {p50:.3f}')
-        lines.append(f'http_request_duration_seconds{{quantile="0.95"}} {p95:.3f}')
-        lines.append(f'http_request_duration_seconds{{quantile="0.99"}} {p99:.3f}')
-        lines.append(f'http_request_duration_seconds_sum {total:.3f}')
-        lines.append(f'http_request_duration_seconds_count {count}')
+        w("\n# HELP http_request_duration_seconds HTTP request duration in seconds\n"
+          "# TYPE http_request_duration_seconds summary\n"
+          f'http_request_duration_seconds{{quantile="0.5"}} {p50:.3f}\n'
+          f'http_request_duration_seconds{{quantile="0.95"}} {p95:.3f}\n'
+          f'http_request_duration_seconds{{quantile="0.99"}} {p99:.3f}\n'
+          f'http_request_duration_seconds_sum {total:.3f}\n'
+          f'http_request_duration_seconds_count {count}\n')
     
     # Tool duration percentiles
-    lines.append("")
-    lines.append("# HELP tool_execution_duration_seconds Tool execution duration in seconds")
-    lines.append("# TYPE tool_execution_duration_seconds summary")
+    w("\n# HELP tool_execution_duration_seconds Tool execution duration in seconds\n"
+      "# TYPE tool_execution_duration_seconds summary\n")
     for tool_name, durations in stats["tool_durations"].items():
         if durations:
-            sorted_durations = sorted(durations)
-            count = len(sorted_durations)
-            total = sum(sorted_durations)
-            p50 = sorted_durations[int(count * 0.5)] if count > 0 else 0
-            p95 = sorted_durations[int(count * 0.95)] if count > 0 else 0
-            p99 = sorted_durations[int(count * 0.99)] if count > 0 else 0
+            count = len(durations)
+            total = sum(durations)
+            p50, p95, p99 = _select_ranks(
+                durations, [int(count * 0.5), int(count * 0.95), int(count * 0.99)]
+            )
             
-            lines.append(f'tool_execution_duration_seconds{{tool_name="{tool_name}",quantile="0.5"}} {p50:.3f}')
-            lines.append(f'tool_execution_duration_seconds{{tool_name="{tool_name}",quantile="0.95"}} {p95:.3f}')
-            lines.append(f'tool_execution_duration_seconds{{tool_name="{tool_name}",quantile="0.99"}} {p99:.3f}')
-            lines.append(f'tool_execution_duration_seconds_sum{{tool_name="{tool_name}"}} {total:.3f}')
-            lines.append(f'tool_execution_duration_seconds_count{{tool_name="{tool_name}"}} {count}')
+            w(f'tool_execution_duration_seconds{{tool_name="{tool_name}",quantile="0.5"}} {p50:.3f}\n'
+              f'tool_execution_duration_seconds{{tool_name="{tool_name}",quantile="0.95"}} {p95:.3f}\n'
+              f'tool_execution_duration_seconds{{tool_name="{tool_name}",quantile="0.99"}} {p99:.3f}\n'
+              f'tool_execution_duration_seconds_sum{{tool_name="{tool_name}"}} {total:.3f}\n'
+              f'tool_execution_duration_seconds_count{{tool_name="{tool_name}"}} {count}\n')
+    
+    return buf.getvalue()
+
+
+def _init_worker_state(server: Any, worker: Any) -> None:
+    """
+    Gunicorn post_fork hook: give each worker its own process-local state
     
-    return '\n'.join(lines) + '\n'
+    The app is preloaded in the master, so workers inherit its module state.
+    The HTTP logger is replaced with a fresh instance (private writer
+    threads and locks; the master keeps running log cleanup), and caches
+    that hold threads or locks are dropped.
+    """
+    global _http_logger
+    if _http_logger:
+        _http_logger = HTTPLogger(
+            str(_http_logger.log_dir),
+            _http_logger.retention_days,
+            _http_logger.cleanup_interval,
+        )
+    _registry_cache.clear()
+    _workdir_cache.clear()
+    _metrics_file_cache.clear()
+    _dashboard_file_cache.clear()
+
+
+def _on_worker_exit(server: Any, worker: Any) -> None:
+    """Gunicorn hook: drain queued log entries before a worker exits"""
+    if _http_logger:
+        _http_logger.close()
 
 
-def run_http_server(config: Config, host: str, port: int) -> None:
+def _shutdown_http_logger(logger: HTTPLogger) -> None:
+    """Stop the log cleanup thread and drain the log writers (idempotent)"""
+    logger.stop_cleanup_thread()
+    logger.close()
+
+
+@contextmanager
+def _server_lifecycle(logger: Optional[HTTPLogger]) -> Iterator[None]:
+    """
+    Own the server's shutdown: Ctrl+C exits cleanly and the HTTP logger is
+    always shut down, on normal return, on error and (via atexit) on
+    SIGTERM-driven interpreter exit
+    """
+    if logger:
+        atexit.register(_shutdown_http_logger, logger)
+    try:
+        yield
+    except KeyboardInterrupt:
+        console.print("\n\n[yellow]Server stopped[/yellow]")
+        sys.exit(0)
+    finally:
+        if logger:
+            atexit.unregister(_shutdown_http_logger)
+            _shutdown_http_logger(logger)
+
+
+def run_http_server(
+    config: Config,
+    host: str,
+    port: int,
+    threads: int = 5,
+    workers: Optional[int] = None,
+) -> None:
     """
     Run HTTP server using Gunicorn for production
     
+    The worker class defaults to gthread and can be overridden with
+    CFUSE_GUNICORN_WORKER_CLASS (e.g. "sync" to get one request per worker).
+    
     Args:
         config: Configuration object
         host: Host address to bind to
         port: Port to listen on
+        threads: Request threads per Gunicorn worker (gthread only)
+        workers: Gunicorn worker processes (default: 2 × CPU cores + 1,
+            capped by CFUSE_MAX_WORKERS, default 16)
     """
     global _global_config, _http_logger
     _global_config = config
@@ -764,9 +1237,7 @@ def run_http_server(config: Config, host: str, port: int) -> None:
     
     if use_gunicorn:
         # Use Gunicorn for production
-        try:
-            import gunicorn.app.base
-        except ImportError:
+        if gunicorn is None:
             console.print("[red]Error:[/red] Gunicorn not installed. Install with: pip install gunicorn")
             console.print("[yellow]Tip:[/yellow] Or set CFUSE_USE_DEV_SERVER=1 to use development server")
             sys.exit(1)
@@ -785,27 +1256,39 @@ def run_http_server(config: Config, host: str, port: int) -> None:
             def load(self):
                 return self.application
         
-        # Determine number of workers (2-4 × CPU cores, max 16)
-        import multiprocessing
-        cpu_count = multiprocessing.cpu_count()
-        workers = min(cpu_count * 2, 16)
+        # Determine number of workers (2 × CPU cores + 1, capped)
+        auto_workers = workers is None
+        if auto_workers:
+            max_workers = int(os.getenv("CFUSE_MAX_WORKERS", "16"))
+            workers = min(2 * multiprocessing.cpu_count() + 1, max_workers)
+        workers = max(1, workers)
+        
+        # Tool calls mostly wait on I/O, so each worker serves several at once.
+        # Gunicorn silently upgrades sync to gthread when threads > 1.
+        worker_class = os.getenv("CFUSE_GUNICORN_WORKER_CLASS", "gthread")
+        threads = max(1, threads) if worker_class == 'gthread' else 1
         
         # Gunicorn options
         options = {
             'bind': f'{host}:{port}',
             'workers': workers,
-            'worker_class': 'sync',
+            'worker_class': worker_class,
+            'threads': threads,
+            'reuse_port': True,  # SO_REUSEPORT on the listening socket
             'timeout': 300,  # 5 minutes for long-running tools
             'graceful_timeout': 30,
             'keepalive': 5,
             'accesslog': '-',  # Log to stdout
             'errorlog': '-',
             'access_log_format': '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s',
-            'preload_app': False,  # Load app in each worker (better isolation)
+            'preload_app': True,  # Import once in the master, share pages copy-on-write
+            'post_fork': _init_worker_state,
+            'worker_exit': _on_worker_exit,
         }
         
         console.print(f"\n[green]✓ CFuse HTTP Server started (Production Mode)[/green]")
-        console.print(f"[cyan]Workers:[/cyan] {workers}")
+        workers_source = "auto" if auto_workers else "--workers"
+        console.print(f"[cyan]Workers:[/cyan] {workers} ({workers_source}) × {threads} threads ({worker_class})")
         if host == "0.0.0.0":
             console.print(f"[cyan]Listening on:[/cyan] http://0.0.0.0:{port} (all interfaces)")
             console.print(f"[cyan]Access via:[/cyan] http://localhost:{port} or http://<your-ip>:{port}")
@@ -815,13 +1298,8 @@ def run_http_server(config: Config, host: str, port: int) -> None:
         console.print(f"[cyan]Metrics:[/cyan] http://{host}:{port}/metrics (log-based)")
         console.print(f"[cyan]Press Ctrl+C to stop[/cyan]\n")
         
-        try:
+        with _server_lifecycle(_http_logger):
             StandaloneApplication(app, options).run()
-        except KeyboardInterrupt:
-            console.print("\n\n[yellow]Server stopped[/yellow]")
-            if _http_logger:
-                _http_logger.stop_cleanup_thread()
-            sys.exit(0)
     
     else:
         # Use Flask development server (NOT for production)
@@ -833,10 +1311,5 @@ def run_http_server(config: Config, host: str, port: int) -> None:
             console.print(f"[cyan]Listening on:[/cyan] http://{host}:{port}")
         console.print(f"[cyan]Press Ctrl+C to stop[/cyan]\n")
         
-        try:
+        with _server_lifecycle(_http_logger):
             app.run(host=host, port=port, debug=False, threaded=True)
-        except KeyboardInterrupt:
-            console.print("\n\n[yellow]Server stopped[/yellow]")
-            if _http_logger:
-                _http_logger.stop_cleanup_thread()
-            sys.exit(0)
@@ -2,20 +2,66 @@
 Interactive Mode - REPL for continuous conversation
 """
 
-import json
-from datetime import datetime
-from typing import Dict, Any, List
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
 from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import InMemoryHistory
+from rich.text import Text
 
-from codefuse.llm.base import Message, MessageRole
+from codefuse import _json
 from codefuse.observability import mainLogger, get_session_dir, close_all_loggers
 
 console = Console()
 
+# Styled prefixes for per-event lines; the dynamic tail is appended as plain
+# text, so tool names, arguments and results are never parsed as markup
+_TOOL_START_PREFIX = Text.assemble("\n", ("🔧 Executing tool:", "cyan"), " ")
+_TOOL_REJECTED_PREFIX = Text.assemble(("⚠️  Tool rejected:", "yellow"), " ")
+_ERROR_PREFIX = Text.assemble("\n", ("Error:", "red"), " ")
+
+# Static banner content, parsed from markup once
+_WELCOME_FOOTER = Text.from_markup(
+    "[dim]Type your message and press Enter to send.[/dim]\n"
+    "[dim]Special commands:[/dim]\n"
+    "  /exit, /quit - Exit the session\n"
+    "  /help - Show help information\n"
+    "  /clear - Clear conversation history\n"
+    "  /status - Show session status"
+)
+
+_HELP_PANEL = Panel(
+    Text.from_markup(
+        "[bold]Interactive Mode Commands[/bold]\n\n"
+        "/exit, /quit - Exit interactive mode\n"
+        "/help - Show this help message\n"
+        "/clear - Clear conversation history\n"
+        "/status - Show current session status\n\n"
+        "[dim]Just type your message to chat with the assistant.[/dim]"
+    ),
+    border_style="blue",
+    title="Help"
+)
+
+
+def _write_raw(text: str, flush: bool) -> None:
+    """
+    Write streamed model text as-is, bypassing rich rendering
+    
+    Deltas are plain text (a "[" in them is not markup). They go to the same
+    sys.stdout text stream as the console, so ordering with styled output is
+    kept.
+    
+    Args:
+        text: Text to write
+        flush: Flush immediately (on a terminal, so tokens appear as they arrive)
+    """
+    out = sys.stdout
+    out.write(text)
+    if flush:
+        out.flush()
+
 
 def run_interactive(
     components: Dict[str, Any],
@@ -40,39 +86,47 @@ def run_interactive(
     context_engine = components["context_engine"]
     metrics_collector = components["metrics_collector"]
     resumed_conversation = components["resumed_conversation"]
+    trajectory_writer = components["trajectory_writer"]
+    llm_messages_writer = components["llm_messages_writer"]
     
     # Display welcome message
     console.print()
     
-    # Build session info
-    session_info = f"Session ID: {context_engine.session_id}"
+    # Build session info (plain text fields, static footer)
+    welcome = Text()
+    welcome.append("CodeFuse Interactive Mode", style="bold blue")
+    welcome.append(
+        f"\n\nAgent: {agent_profile.name}\n"
+        f"Model: {model_name}\n"
+        f"Session ID: {context_engine.session_id}"
+    )
     if resumed_conversation:
-        session_info += f"\n[cyan]Resumed with {len(resumed_conversation)} messages[/cyan]"
+        welcome.append(f"\nResumed with {len(resumed_conversation)} messages", style="cyan")
+    welcome.append("\n\n")
+    welcome.append(_WELCOME_FOOTER)
     
-    console.print(Panel(
-        f"[bold blue]CodeFuse Interactive Mode[/bold blue]\n\n"
-        f"Agent: {agent_profile.name}\n"
-        f"Model: {model_name}\n"
-        f"{session_info}\n\n"
-        f"[dim]Type your message and press Enter to send.[/dim]\n"
-        f"[dim]Special commands:[/dim]\n"
-        f"  /exit, /quit - Exit the session\n"
-        f"  /help - Show help information\n"
-        f"  /clear - Clear conversation history\n"
-        f"  /status - Show session status",
-        border_style="blue"
-    ))
+    console.print(Panel(welcome, border_style="blue"))
     console.print()
     
     if config.agent_config.yolo:
         console.print("[yellow]⚡ YOLO mode enabled - auto-confirming all tools[/yellow]\n")
     
-    # Initialize prompt session with history
-    session = PromptSession(history=InMemoryHistory())
+    # Initialize prompt session with history. Piped stdin (CI, scripts)
+    # reads plain lines; prompt_toolkit is only loaded for a terminal.
+    if sys.stdin.isatty():
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import InMemoryHistory
+        
+        prompt = PromptSession(history=InMemoryHistory()).prompt
+    else:
+        prompt = input
     
-    # Conversation history (for context across multiple turns)
-    # If resuming a session, start with the loaded history
-    conversation_history: List[Message] = resumed_conversation if resumed_conversation else []
+    # REPL state; a resumed session continues its turn count
+    command_context = _CommandContext(
+        components=components,
+        turn_count=len(resumed_conversation) // 2 if resumed_conversation else 0,
+    )
+    flush_chunks = sys.stdout.isatty()
     
     mainLogger.info("Interactive mode started", session_id=context_engine.session_id)
     
@@ -80,38 +134,21 @@ def run_interactive(
     while True:
         try:
             # Get user input
-            user_input = session.prompt("You: ").strip()
+            user_input = prompt("You: ").strip()
             
             if not user_input:
                 continue
             
             # Handle special commands
-            if user_input.startswith("/"):
-                if user_input in ["/exit", "/quit"]:
-                    console.print("\n[yellow]Exiting interactive mode...[/yellow]")
-                    break
-                
-                elif user_input == "/help":
-                    _show_help()
-                    continue
-                
-                elif user_input == "/clear":
-                    conversation_history.clear()
-                    # Note: This only clears local conversation history
-                    # ContextEngine messages are not cleared (would need session restart)
-                    console.print("[green]✓ Local conversation history cleared[/green]")
-                    console.print("[dim]Note: Full reset requires restarting the session[/dim]\n")
-                    mainLogger.info("Conversation history cleared", session_id=context_engine.session_id)
-                    continue
-                
-                elif user_input == "/status":
-                    _show_status(components, conversation_history)
-                    continue
-                
-                else:
+            if user_input[0] == "/":
+                handler = _COMMANDS.get(user_input)
+                if handler is None:
                     console.print(f"[red]Unknown command:[/red] {user_input}")
                     console.print("[dim]Type /help for available commands[/dim]\n")
                     continue
+                if handler(command_context) is _EXIT:
+                    break
+                continue
             
             # User message will be logged by agent_loop automatically
             
@@ -119,11 +156,6 @@ def run_interactive(
             console.print("\n[dim]Assistant:[/dim] ", end="")
             
             # Run agent loop
-            final_response = ""
-            current_content = ""
-            current_tool_calls = []
-            iterations = 1
-            
             for event in agent_loop.run(
                 user_query=user_input,
                 stream=stream,
@@ -131,30 +163,27 @@ def run_interactive(
                 if event.type == "llm_start":
                     iteration = event.data.get("iteration", 0)
                     if iteration > 1:
-                        console.print(f"\n[dim]→ Iteration {iteration}[/dim]")
+                        console.print(Text(f"\n→ Iteration {iteration}", style="dim"))
                 
                 elif event.type == "llm_chunk":
                     delta = event.data["delta"]
-                    console.print(delta, end="")
-                    current_content += delta
+                    _write_raw(delta, flush_chunks)
                 
                 elif event.type == "llm_done":
                     if not stream:
                         content = event.data["content"]
                         if content:
                             console.print(content)
-                            current_content = content
                     else:
                         console.print()
-                    
-                    if "tool_calls" in event.data and event.data["tool_calls"]:
-                        current_tool_calls = event.data["tool_calls"]
                 
                 elif event.type == "tool_start":
                     tool_name = event.data["tool_name"]
                     arguments = event.data.get("arguments", {})
-                    args_str = _format_tool_arguments(arguments)
-                    console.print(f"\n[cyan]🔧 Executing tool:[/cyan] {tool_name}{args_str}")
+                    line = _TOOL_START_PREFIX.copy()
+                    line.append(tool_name)
+                    line.append(_format_tool_arguments(arguments))
+                    console.print(line)
                 
                 elif event.type == "tool_done":
                     tool_name = event.data["tool_name"]
@@ -164,51 +193,42 @@ def run_interactive(
                     confirmed = event.data.get("confirmed", True)
                     
                     if not confirmed:
-                        console.print(f"[yellow]⚠️  Tool rejected:[/yellow] {tool_name}")
+                        line = _TOOL_REJECTED_PREFIX.copy()
+                        line.append(tool_name)
+                        console.print(line)
                     else:
                         # Use display field (user-friendly) instead of result (LLM content)
-                        console.print(f"[cyan]{display}[/cyan]")
+                        console.print(Text(str(display), style="cyan"))
                     
                     # Tool results are logged by tool_executor automatically
                 
                 elif event.type == "agent_done":
-                    final_response = event.data["final_response"]
-                    iterations = event.data["iterations"]
-                    
-                    # Save assistant message to trajectory
-                    assistant_message = {
-                        "role": "assistant",
-                        "content": final_response or current_content,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                    if current_tool_calls:
-                        assistant_message["tool_calls"] = current_tool_calls
                     # Assistant messages are logged by agent_loop automatically
                     
-                    # Update conversation history for next turn
-                    conversation_history.append(Message(
-                        role=MessageRole.USER,
-                        content=user_input,
-                    ))
-                    conversation_history.append(Message(
-                        role=MessageRole.ASSISTANT,
-                        content=final_response or current_content,
-                    ))
+                    # The transcript itself is kept by the context engine
+                    command_context.turn_count += 1
+                    
+                    # Persist this turn's buffered trajectory/messages
+                    trajectory_writer.flush()
+                    llm_messages_writer.flush()
                     
                     console.print()
                 
                 elif event.type == "error":
                     error = event.data["error"]
-                    console.print(f"\n[red]Error:[/red] {error}")
-            
-            # Reset for next turn
-            current_content = ""
-            current_tool_calls = []
+                    line = _ERROR_PREFIX.copy()
+                    line.append(str(error))
+                    console.print(line)
         
         except KeyboardInterrupt:
             console.print("\n\n[yellow]Use /exit or /quit to exit[/yellow]\n")
             continue
         
+        except EOFError:
+            # End of piped input (or Ctrl-D)
+            console.print("\n[yellow]Exiting interactive mode...[/yellow]")
+            break
+        
         except Exception as e:
             console.print(f"\n[red]Error:[/red] {str(e)}\n")
             mainLogger.error("Interactive loop error", error=str(e), exc_info=True)
@@ -248,67 +268,121 @@ def run_interactive(
     close_all_loggers()
 
 
-def _format_tool_arguments(arguments: Dict[str, Any], max_length: int = 100) -> str:
+@dataclass(slots=True)
+class _CommandContext:
+    """REPL state passed to slash-command handlers"""
+    components: Dict[str, Any]
+    turn_count: int = 0
+
+
+# Returned by a command handler to leave the REPL
+_EXIT = object()
+
+
+def _cmd_exit(ctx: _CommandContext) -> object:
+    """Handle /exit and /quit"""
+    console.print("\n[yellow]Exiting interactive mode...[/yellow]")
+    return _EXIT
+
+
+def _cmd_help(ctx: _CommandContext) -> None:
+    """Handle /help"""
+    _show_help()
+
+
+def _cmd_clear(ctx: _CommandContext) -> None:
+    """Handle /clear"""
+    ctx.turn_count = 0
+    # Note: This only clears local conversation history
+    # ContextEngine messages are not cleared (would need session restart)
+    console.print("[green]✓ Local conversation history cleared[/green]")
+    console.print("[dim]Note: Full reset requires restarting the session[/dim]\n")
+    mainLogger.info("Conversation history cleared", session_id=ctx.components["context_engine"].session_id)
+
+
+def _cmd_status(ctx: _CommandContext) -> None:
+    """Handle /status"""
+    _show_status(ctx.components, ctx.turn_count)
+
+
+_COMMANDS: Dict[str, Callable[[_CommandContext], Any]] = {
+    "/exit": _cmd_exit,
+    "/quit": _cmd_exit,
+    "/help": _cmd_help,
+    "/clear": _cmd_clear,
+    "/status": _cmd_status,
+}
+
+
+def _format_tool_arguments(arguments: Dict[str, Any], max_length: int = 100) -> Text:
     """
     Format tool arguments for display, with truncation if too long
     
+    Items are serialized one at a time and serialization stops once the
+    output exceeds max_length, so large payloads (file contents, diffs) are
+    not encoded only to be cut off. Long string values are clipped before
+    encoding, which leaves the visible prefix unchanged.
+    
     Args:
         arguments: Tool arguments dictionary
         max_length: Maximum length before truncation
         
     Returns:
-        Formatted string representation of arguments
+        Dimmed text of the arguments (with a leading space), empty if none
     """
     if not arguments:
-        return ""
+        return Text()
     
-    # Convert arguments to JSON string
-    args_json = json.dumps(arguments, ensure_ascii=False)
+    # Convert arguments to JSON, one item at a time within the budget
+    parts = []
+    length = 0  # len("{" + ", ".join(parts) + "}")
+    for key, value in arguments.items():
+        if isinstance(value, str) and len(value) > max_length:
+            value = value[:max_length]
+        part = f"{_json.dumps(str(key)).decode()}: {_json.dumps(value).decode()}"
+        parts.append(part)
+        length += len(part) + 2
+        if length > max_length:
+            break
+    args_json = "{" + ", ".join(parts) + "}"
     
     # If short enough, return as-is
     if len(args_json) <= max_length:
-        return f" [dim]{args_json}[/dim]"
+        return Text(f" {args_json}", style="dim")
     
     # Truncate and add ellipsis
     truncated = args_json[:max_length] + "..."
-    return f" [dim]{truncated}[/dim]"
+    return Text(f" {truncated}", style="dim")
 
 
 def _show_help():
     """Show help information"""
     console.print()
-    console.print(Panel(
-        "[bold]Interactive Mode Commands[/bold]\n\n"
-        "/exit, /quit - Exit interactive mode\n"
-        "/help - Show this help message\n"
-        "/clear - Clear conversation history\n"
-        "/status - Show current session status\n\n"
-        "[dim]Just type your message to chat with the assistant.[/dim]",
-        border_style="blue",
-        title="Help"
-    ))
+    console.print(_HELP_PANEL)
     console.print()
 
 
-def _show_status(components: Dict[str, Any], conversation_history: List[Message]):
+def _show_status(components: Dict[str, Any], turn_count: int):
     """Show current session status"""
     agent_profile = components["agent_profile"]
     model_name = components["model_name"]
     context_engine = components["context_engine"]
     config = components["config"]
     
-    console.print()
-    console.print(Panel(
-        f"[bold]Session Status[/bold]\n\n"
-        f"Session ID: {context_engine.session_id}\n"
+    # Field values are appended as plain text, so no markup is parsed
+    status = Text()
+    status.append("Session Status", style="bold")
+    status.append(
+        f"\n\nSession ID: {context_engine.session_id}\n"
         f"Agent: {agent_profile.name}\n"
         f"Model: {model_name}\n"
-        f"Conversation Turns: {len(conversation_history) // 2}\n"
+        f"Conversation Turns: {turn_count}\n"
         f"Max Iterations: {config.agent_config.max_iterations}\n"
         f"YOLO Mode: {'Enabled' if config.agent_config.yolo else 'Disabled'}\n"
-        f"Logs: {get_session_dir()}",
-        border_style="blue",
-        title="Status"
-    ))
+        f"Logs: {get_session_dir()}"
+    )
+    
+    console.print()
+    console.print(Panel(status, border_style="blue", title="Status"))
     console.print()
 
@@ -2,18 +2,74 @@
 Main CLI Entry Point - Unified command-line interface
 """
 
+import os
 import sys
-import json
+from typing import NoReturn
+
 import click
-from rich.console import Console
 
-from codefuse.config import Config
-from codefuse.core import AgentProfileManager, AgentProfile
-from codefuse.cli.common import initialize_agent_components, handle_list_agents
-from codefuse.cli.headless import run_headless
-from codefuse.cli.interactive import run_interactive
+from codefuse import _json
+
+# rich is imported on first print so runs that never render skip its import cost
+_console = None
+
+
+def _get_console():
+    """Get the shared rich Console, creating it on first use"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def _handle_eager_list_agents(ctx: click.Context, param: click.Parameter, value: bool) -> bool:
+    """
+    Handle --list-agents before the other options are parsed and validated
+    """
+    if value:
+        from codefuse.core.agent_config import AgentProfileManager
+        from codefuse.cli.common import handle_list_agents
+        
+        handle_list_agents(AgentProfileManager())
+        ctx.exit(0)
+    return value
+
 
-console = Console()
+def _die(message: str, code: int = 1) -> NoReturn:
+    """
+    Report an argument error on stderr and exit
+    
+    Used for failures before any component is initialized: the message is
+    written as-is (no rich markup parsing, so paths with brackets survive)
+    and colored only when stderr is a terminal.
+    """
+    if sys.stderr.isatty() and "NO_COLOR" not in os.environ:
+        sys.stderr.write(f"\x1b[31mError:\x1b[0m {message}\n")
+    else:
+        sys.stderr.write(f"Error: {message}\n")
+    sys.exit(code)
+
+
+def _read_file_bytes(path: str) -> bytes:
+    """
+    Read a whole file with raw fd reads sized from fstat
+    
+    Skips the buffered/text IO layers; the loop still handles files that
+    grow or report a short size (e.g. pipes or procfs).
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size, 65536))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
 
 
 @click.command()
@@ -79,6 +135,9 @@ console = Console()
 @click.option(
     "--list-agents",
     is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=_handle_eager_list_agents,
     help="List available agent profiles and exit"
 )
 @click.option(
@@ -136,6 +195,17 @@ console = Console()
     default="0.0.0.0",
     help="Host address for HTTP server mode (default: 0.0.0.0, use 127.0.0.1 for localhost only)"
 )
+@click.option(
+    "--workers",
+    type=int,
+    help="Worker processes for HTTP server mode (default: 2 × CPU cores + 1, max CFUSE_MAX_WORKERS=16)"
+)
+@click.option(
+    "--threads",
+    type=int,
+    default=5,
+    help="Request threads per worker for HTTP server mode (default: 5)"
+)
 @click.option(
     "--remote-tool-enabled",
     is_flag=True,
@@ -178,7 +248,6 @@ def main(
     max_iterations: int,
     stream: bool,
     yolo: bool,
-    list_agents: bool,
     config: str,
     save_session: bool,
     temperature: float,
@@ -190,6 +259,8 @@ def main(
     http: bool,
     port: int,
     host: str,
+    workers: int,
+    threads: int,
     remote_tool_enabled: bool,
     remote_tool_url: str,
     remote_tool_instance_id: str,
@@ -238,55 +309,56 @@ def main(
     try:
         # Check for mutually exclusive parameters
         if prompt and prompt_file:
-            console.print("[red]Error:[/red] Cannot use both -p/--prompt and -pp/--prompt-file at the same time")
-            sys.exit(1)
+            _die("Cannot use both -p/--prompt and -pp/--prompt-file at the same time")
         
         # Validate image_url usage
         if (image_url or image_url_file) and not (prompt or prompt_file):
-            console.print("[red]Error:[/red] --image-url/--image-url-file requires -p/--prompt or -pp/--prompt-file")
-            sys.exit(1)
+            _die("--image-url/--image-url-file requires -p/--prompt or -pp/--prompt-file")
         
         # If prompt-file is provided, read the file content
         if prompt_file:
             try:
-                with open(prompt_file, 'r', encoding='utf-8') as f:
-                    prompt = f.read().strip()
+                prompt = _read_file_bytes(prompt_file).decode('utf-8')
+                if '\r' in prompt:
+                    # Match text-mode universal newlines
+                    prompt = prompt.replace('\r\n', '\n').replace('\r', '\n')
+                prompt = prompt.strip()
                 if not prompt:
-                    console.print(f"[red]Error:[/red] Prompt file '{prompt_file}' is empty")
-                    sys.exit(1)
+                    _die(f"Prompt file '{prompt_file}' is empty")
             except Exception as e:
-                console.print(f"[red]Error:[/red] Failed to read prompt file '{prompt_file}': {e}")
-                sys.exit(1)
+                _die(f"Failed to read prompt file '{prompt_file}': {e}")
         
         # If image-url-file is provided, read and parse the JSON file
         image_urls_from_file = []
         if image_url_file:
             try:
-                with open(image_url_file, 'r', encoding='utf-8') as f:
-                    image_urls_from_file = json.load(f)
+                image_urls_from_file = _json.loads(_read_file_bytes(image_url_file))
                 
                 # Validate that it's a list
                 if not isinstance(image_urls_from_file, list):
-                    console.print(f"[red]Error:[/red] Image URL file '{image_url_file}' must contain a JSON list")
-                    sys.exit(1)
-                
-                # Validate that all elements are strings
-                if not all(isinstance(url, str) for url in image_urls_from_file):
-                    console.print(f"[red]Error:[/red] All elements in image URL file must be strings")
-                    sys.exit(1)
+                    _die(f"Image URL file '{image_url_file}' must contain a JSON list")
                 
+                # Validate that all elements are strings (JSON only yields exact str)
                 if not image_urls_from_file:
-                    console.print(f"[yellow]Warning:[/yellow] Image URL file '{image_url_file}' is empty")
+                    _get_console().print(f"[yellow]Warning:[/yellow] Image URL file '{image_url_file}' is empty")
+                elif not all(type(url) is str for url in image_urls_from_file):
+                    _die("All elements in image URL file must be strings")
                 
-            except json.JSONDecodeError as e:
-                console.print(f"[red]Error:[/red] Failed to parse JSON from '{image_url_file}': {e}")
-                sys.exit(1)
+            except (_json.JSONDecodeError, UnicodeDecodeError) as e:
+                _die(f"Failed to parse JSON from '{image_url_file}': {e}")
             except Exception as e:
-                console.print(f"[red]Error:[/red] Failed to read image URL file '{image_url_file}': {e}")
-                sys.exit(1)
+                _die(f"Failed to read image URL file '{image_url_file}': {e}")
         
         # Merge image URLs from both sources (CLI args and file)
-        all_image_urls = list(image_url) + image_urls_from_file
+        # (click already passes a tuple; only build a new one when both are set)
+        if image_urls_from_file:
+            all_image_urls = image_url + tuple(image_urls_from_file)
+        else:
+            all_image_urls = image_url
+        
+        # The agent/LLM stack is imported only by the mode that needs it,
+        # so --help and argument errors return without loading it
+        from codefuse.config import Config
         
         # Handle HTTP server mode
         if http:
@@ -302,16 +374,10 @@ def main(
                 "logs_dir": logs_dir,
             }
             
-            cfg = Config.merge_with_cli_args(cfg, **cli_args)
+            cfg = Config.merge_with_cli_args(cfg, cli_args)
             
             # Start HTTP server
-            run_http_server(cfg, host, port)
-            return
-        
-        # Handle --list-agents early (no need to initialize components)
-        if list_agents:
-            agent_manager = AgentProfileManager()
-            handle_list_agents(agent_manager)
+            run_http_server(cfg, host, port, threads=threads, workers=workers)
             return
         
         # Load configuration
@@ -339,32 +405,36 @@ def main(
             "remote_tool_timeout": remote_tool_timeout,
         }
         
-        cfg = Config.merge_with_cli_args(cfg, **cli_args)
+        cfg = Config.merge_with_cli_args(cfg, cli_args)
         
         # Validate configuration
         validation_errors = cfg.validate()
         if validation_errors:
-            console.print("[red]Configuration Errors:[/red]")
+            _get_console().print("[red]Configuration Errors:[/red]")
             for error in validation_errors:
-                console.print(f"  - {error}")
+                _get_console().print(f"  - {error}")
             sys.exit(1)
         
         # Handle --agent-file: load agent profile from file
         loaded_agent_profile = None
         if agent_file:
+            from codefuse.core.agent_config import AgentProfile
+            
             try:
-                console.print(f"[cyan]Loading agent from file:[/cyan] {agent_file}")
+                _get_console().print(f"[cyan]Loading agent from file:[/cyan] {agent_file}")
                 loaded_agent_profile = AgentProfile.from_markdown(agent_file)
-                console.print(f"[green]✓ Agent loaded:[/green] {loaded_agent_profile.name}")
+                _get_console().print(f"[green]✓ Agent loaded:[/green] {loaded_agent_profile.name}")
             except Exception as e:
-                console.print(f"[red]Error:[/red] Failed to load agent from file '{agent_file}'")
-                console.print(f"[red]Reason:[/red] {str(e)}")
+                _get_console().print(f"[red]Error:[/red] Failed to load agent from file '{agent_file}'")
+                _get_console().print(f"[red]Reason:[/red] {str(e)}")
                 if verbose:
                     import traceback
-                    console.print(traceback.format_exc())
+                    _get_console().print(traceback.format_exc())
                 sys.exit(1)
         
         # Initialize all components once (shared by both modes)
+        from codefuse.cli.common import initialize_agent_components
+        
         components = initialize_agent_components(
             cfg=cfg,
             agent_name=agent,
@@ -376,28 +446,32 @@ def main(
         # Route to appropriate mode based on presence of prompt
         if prompt:
             # Headless mode: single prompt execution
+            from codefuse.cli.headless import run_headless
+            
             run_headless(
                 prompt=prompt,
                 components=components,
                 stream=stream,
-                image_urls=tuple(all_image_urls),
+                image_urls=all_image_urls,
             )
         else:
             # Interactive mode: REPL
+            from codefuse.cli.interactive import run_interactive
+            
             run_interactive(
                 components=components,
                 stream=stream,
             )
     
     except KeyboardInterrupt:
-        console.print("\n\n[yellow]Interrupted by user[/yellow]")
+        _get_console().print("\n\n[yellow]Interrupted by user[/yellow]")
         sys.exit(130)
     
     except Exception as e:
-        console.print(f"\n[red]Error:[/red] {str(e)}")
+        _get_console().print(f"\n[red]Error:[/red] {str(e)}")
         if verbose:
             import traceback
-            console.print(traceback.format_exc())
+            _get_console().print(traceback.format_exc())
         sys.exit(1)
 
 
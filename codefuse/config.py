@@ -4,15 +4,21 @@ Configuration Management
 
 import os
 import copy
-from dataclasses import dataclass, fields
+from operator import attrgetter
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Callable, Mapping, Sequence, Tuple, Union
 import yaml
 
+from codefuse import _json
 from codefuse.observability import mainLogger
 
 
-@dataclass
+# libyaml-backed loader when PyYAML was built with it
+_YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@dataclass(slots=True)
 class LLMConfig:
     """LLM configuration"""
     provider: Optional[str] = None
@@ -28,7 +34,7 @@ class LLMConfig:
     top_p: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """Agent configuration"""
     max_iterations: Optional[int] = None
@@ -44,15 +50,55 @@ class AgentConfig:
     remote_tool_url: Optional[str] = None
     remote_tool_instance_id: Optional[str] = None
     remote_tool_timeout: Optional[int] = None
+    # Cache for workspace_root_resolved: ((workspace_root, cwd), resolved path)
+    _workspace_root_resolved: Optional[Tuple[Tuple[str, str], Path]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def workspace_root_resolved(self) -> Path:
+        """workspace_root expanded and resolved, cached until workspace_root changes"""
+        # Kept in a non-init field, which the merge/load field sets skip;
+        # relative roots (the default ".") also depend on the current directory
+        key = (self.workspace_root, os.getcwd())
+        cached = self._workspace_root_resolved
+        if cached is None or cached[0] != key:
+            cached = (key, Path(self.workspace_root).expanduser().resolve())
+            self._workspace_root_resolved = cached
+        return cached[1]
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration"""
     logs_dir: Optional[str] = None
     verbose: Optional[bool] = None
 
 
+# Field names of each section, for filtering keys read from files
+# (init fields only: internal caches are not configuration)
+_LLM_FIELDS = frozenset(f.name for f in fields(LLMConfig) if f.init)
+_AGENT_FIELDS = frozenset(f.name for f in fields(AgentConfig) if f.init)
+_LOG_FIELDS = frozenset(f.name for f in fields(LoggingConfig) if f.init)
+
+_SECTION_FIELDS = {
+    "llm": _LLM_FIELDS,
+    "agent_config": _AGENT_FIELDS,
+    "logging": _LOG_FIELDS,
+}
+
+# Config section holding each field, for matching CLI args by name
+# (on a name clash the earlier section wins)
+_CLI_FIELD_SECTIONS = {
+    field.name: section_name
+    for section_name, section_cls in reversed(
+        [("llm", LLMConfig), ("agent_config", AgentConfig), ("logging", LoggingConfig)]
+    )
+    for field in fields(section_cls)
+    if field.init
+}
+
+
 # Default values (centralized)
 DEFAULTS = {
     "llm": {
@@ -90,6 +136,11 @@ DEFAULTS = {
 }
 
 
+# Config files tried in order when no path is given
+DEFAULT_CONFIG_PATHS = (".cfuse.yaml", "~/.cfuse.yaml", "~/.config/cfuse/config.yaml")
+_DEFAULT_CONFIG_FILES = tuple(Path(p).expanduser() for p in DEFAULT_CONFIG_PATHS)
+
+
 # Environment variable mapping (only core configs)
 ENV_MAPPING = [
     ("api_key", "llm", str, ["OPENAI_API_KEY"]),
@@ -112,21 +163,46 @@ VALIDATIONS = [
     ('agent_config', 'remote_tool_timeout', lambda v: v > 0, "remote_tool_timeout must be positive"),
 ]
 
+# VALIDATIONS with pre-built dotted getters
+_VALIDATION_RULES = [
+    (attrgetter(f"{section}.{field_name}"), check, msg)
+    for section, field_name, check, msg in VALIDATIONS
+]
 
-def _get_env_value(env_vars: List[str], type_: type) -> Any:
-    """Get first available environment variable and convert to type"""
+# Required LLM fields: (getter, error message)
+_REQUIRED_LLM_RULES = [
+    (
+        attrgetter(f"llm.{field_name}"),
+        f"{display_name} is required. "
+        f"Set it via --{field_name.replace('_', '-')} flag, "
+        f"{field_name.upper().replace('MODEL', 'LLM_MODEL')} environment variable, "
+        f"or config file.",
+    )
+    for field_name, display_name in [
+        ('api_key', 'LLM API key'),
+        ('model', 'LLM model'),
+        ('base_url', 'LLM base URL'),
+    ]
+]
+
+
+def _env_bool(value: str) -> bool:
+    """Interpret an environment variable as a boolean flag"""
+    return value.lower() in ('true', '1', 'yes')
+
+
+# Converter per ENV_MAPPING type; an unsupported type fails at import
+_ENV_CONVERTERS = {bool: _env_bool, int: int, float: float, str: str}
+
+
+def _get_env_value(env_vars: Sequence[str], convert: Callable[[str], Any]) -> Any:
+    """Get first available environment variable that converts cleanly"""
+    environ = os.environ
     for env_var in env_vars:
-        value = os.getenv(env_var)
+        value = environ.get(env_var)
         if value is not None:
             try:
-                if type_ == bool:
-                    return value.lower() in ('true', '1', 'yes')
-                elif type_ == int:
-                    return int(value)
-                elif type_ == float:
-                    return float(value)
-                else:
-                    return value
+                return convert(value)
             except (ValueError, AttributeError) as e:
                 mainLogger.warning(
                     "Failed to convert environment variable",
@@ -137,6 +213,66 @@ def _get_env_value(env_vars: List[str], type_: type) -> Any:
     return None
 
 
+# ENV_MAPPING resolved once: (section getter, field, env var names, converter)
+_ENV_APPLIERS = [
+    (
+        attrgetter('agent_config' if section == 'agent' else section),
+        field_name,
+        tuple(env_vars),
+        _ENV_CONVERTERS[type_],
+    )
+    for field_name, section, type_, env_vars in ENV_MAPPING
+]
+
+
+def _expand_str(text: str) -> str:
+    """
+    Substitute ${VAR} and $VAR references in one left-to-right scan
+    
+    Unset variables (and a bare '$' or '${}') are kept verbatim. A name
+    after '$' is a run of word characters (alphanumerics and '_').
+    """
+    out: List[str] = []
+    i = 0
+    n = len(text)
+    while True:
+        j = text.find('$', i)
+        if j < 0:
+            out.append(text[i:])
+            break
+        out.append(text[i:j])
+        
+        if j + 1 < n and text[j + 1] == '{':
+            k = text.find('}', j + 2)
+            if k > j + 2:
+                out.append(os.getenv(text[j + 2:k], text[j:k + 1]))
+                i = k + 1
+                continue
+        else:
+            k = j + 1
+            while k < n and (text[k].isalnum() or text[k] == '_'):
+                k += 1
+            if k > j + 1:
+                out.append(os.getenv(text[j + 1:k], text[j:k]))
+                i = k
+                continue
+        
+        out.append('$')
+        i = j + 1
+    return ''.join(out)
+
+
+def _needs_expansion(data: Any) -> bool:
+    """Check whether any string value (not key) contains a '$'"""
+    if isinstance(data, dict):
+        return any(_needs_expansion(v) for v in data.values())
+    elif isinstance(data, list):
+        return any(_needs_expansion(item) for item in data)
+    elif isinstance(data, str):
+        return '$' in data
+    return False
+
+
 def _expand_env_vars(data: Any) -> Any:
     """Recursively expand ${VAR} in strings"""
     if isinstance(data, dict):
@@ -144,15 +280,13 @@ def _expand_env_vars(data: Any) -> Any:
     elif isinstance(data, list):
         return [_expand_env_vars(item) for item in data]
     elif isinstance(data, str):
-        import re
-        def replacer(match):
-            var_name = match.group(1) or match.group(2)
-            return os.getenv(var_name, match.group(0))
-        return re.sub(r'\$\{([^}]+)\}|\$(\w+)', replacer, data)
+        if '$' not in data:
+            return data
+        return _expand_str(data)
     return data
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Main configuration"""
     llm: LLMConfig = None
@@ -178,17 +312,32 @@ class Config:
         )
     
     @classmethod
-    def from_yaml(cls, path: str) -> Optional["Config"]:
-        """Load config from YAML file"""
-        file_path = Path(path).expanduser()
-        if not file_path.exists():
-            return None
+    def from_yaml(cls, path: Union[str, Path]) -> Optional["Config"]:
+        """
+        Load config from YAML file (JSON documents take a faster path)
+        
+        A str path is tilde-expanded; a Path is used as given.
+        """
+        file_path = path if isinstance(path, Path) else Path(path).expanduser()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
+            try:
+                content = file_path.read_bytes()
+            except FileNotFoundError:
+                return None
+            data = None
+            if content.lstrip()[:1] == b'{':
+                try:
+                    data = _json.loads(content)
+                except _json.JSONDecodeError:
+                    pass  # Flow-style YAML mapping, not JSON
+            if data is None:
+                data = yaml.load(content.decode('utf-8'), Loader=_YAMLLoader)
+            data = data or {}
             
-            data = _expand_env_vars(data)
+            # Most configs have no references: keep the parsed tree as-is
+            if _needs_expansion(data):
+                data = _expand_env_vars(data)
             
             llm_data = data.get('llm', {})
             agent_data = data.get('agent_config', {}) or data.get('agent', {})  # Support both for backward compatibility
@@ -196,9 +345,9 @@ class Config:
             
             mainLogger.info("Loaded configuration from file", path=str(path))
             return cls(
-                llm=LLMConfig(**{k: v for k, v in llm_data.items() if k in {f.name for f in fields(LLMConfig)}}),
-                agent_config=AgentConfig(**{k: v for k, v in agent_data.items() if k in {f.name for f in fields(AgentConfig)}}),
-                logging=LoggingConfig(**{k: v for k, v in logging_data.items() if k in {f.name for f in fields(LoggingConfig)}}),
+                llm=LLMConfig(**{k: v for k, v in llm_data.items() if k in _LLM_FIELDS}),
+                agent_config=AgentConfig(**{k: v for k, v in agent_data.items() if k in _AGENT_FIELDS}),
+                logging=LoggingConfig(**{k: v for k, v in logging_data.items() if k in _LOG_FIELDS}),
             )
         except Exception as e:
             mainLogger.error("Failed to load config from file", path=str(path), error=str(e))
@@ -209,13 +358,10 @@ class Config:
         """Load config from environment variables"""
         cfg = cls()
         
-        # Map 'agent' section in ENV_MAPPING to 'agent_config'
-        for field_name, section, type_, env_vars in ENV_MAPPING:
-            value = _get_env_value(env_vars, type_)
+        for get_section, field_name, env_vars, convert in _ENV_APPLIERS:
+            value = _get_env_value(env_vars, convert)
             if value is not None:
-                section_name = 'agent_config' if section == 'agent' else section
-                section_obj = getattr(cfg, section_name)
-                setattr(section_obj, field_name, value)
+                setattr(get_section(cfg), field_name, value)
         
         return cfg
     
@@ -232,12 +378,14 @@ class Config:
         if config_path:
             file_cfg = cls.from_yaml(config_path)
         else:
-            # Try default locations
+            # Try default locations (only existing files are parsed; an
+            # unreadable one still falls through to the next candidate)
             file_cfg = None
-            for path in [".cfuse.yaml", "~/.cfuse.yaml", "~/.config/cfuse/config.yaml"]:
-                file_cfg = cls.from_yaml(path)
-                if file_cfg:
-                    break
+            for path in _DEFAULT_CONFIG_FILES:
+                if os.path.isfile(path):
+                    file_cfg = cls.from_yaml(path)
+                    if file_cfg:
+                        break
         
         if file_cfg:
             cfg = cls._merge(cfg, file_cfg)
@@ -251,39 +399,65 @@ class Config:
     @staticmethod
     def _merge(base: "Config", override: "Config") -> "Config":
         """Merge configs: non-None values in override take precedence"""
-        result = copy.deepcopy(base)
-        
-        # Merge each section
-        for section_name in ['llm', 'agent_config', 'logging']:
-            base_section = getattr(result, section_name)
+        # Sections are rebuilt field by field (lists copied) rather than
+        # deep-copied, so neither input is shared with or mutated by the result
+        sections = {}
+        for section_name, field_names in _SECTION_FIELDS.items():
+            base_section = getattr(base, section_name)
             override_section = getattr(override, section_name)
             
-            for field in fields(base_section):
-                override_value = getattr(override_section, field.name)
-                if override_value is not None:
-                    setattr(base_section, field.name, override_value)
+            values = {}
+            for name in field_names:
+                value = getattr(override_section, name)
+                if value is None:
+                    value = getattr(base_section, name)
+                if isinstance(value, list):
+                    value = list(value)
+                values[name] = value
+            sections[section_name] = type(base_section)(**values)
         
-        return result
+        return Config(**sections)
     
     @classmethod
-    def merge_with_cli_args(cls, config: "Config", **cli_args) -> "Config":
-        """Merge CLI arguments (highest priority)"""
-        result = copy.deepcopy(config)
+    def merge_with_cli_args(
+        cls,
+        config: "Config",
+        cli_args: Optional[Mapping[str, Any]] = None,
+        **kwargs: Any,
+    ) -> "Config":
+        """
+        Merge CLI arguments (highest priority)
+        
+        Args are matched to config fields by name; None values are ignored.
+        Only the sections that receive a value are copied, so the input
+        config is left unchanged.
+        
+        Args:
+            config: Config to merge into
+            cli_args: Mapping of CLI argument name to value
+            **kwargs: Additional CLI arguments (same as cli_args)
+        """
+        if cli_args is None:
+            cli_args = kwargs
+        elif kwargs:
+            cli_args = {**cli_args, **kwargs}
+        overrides = {key: value for key, value in cli_args.items() if value is not None}
         
         # Special mapping: CLI 'think' → config 'enable_thinking'
-        if cli_args.get('think') is not None:
-            result.llm.enable_thinking = cli_args['think']
+        think = overrides.pop('think', None)
+        if think is not None:
+            overrides.setdefault('enable_thinking', think)
         
-        # Auto-match all other CLI args to config fields by name
-        for key, value in cli_args.items():
-            if value is None or key == 'think':
+        result = copy.copy(config)
+        copied = set()
+        for key, value in overrides.items():
+            section_name = _CLI_FIELD_SECTIONS.get(key)
+            if section_name is None:
                 continue
-            
-            # Try to find matching field in each section
-            for section in [result.llm, result.agent_config, result.logging]:
-                if hasattr(section, key):
-                    setattr(section, key, value)
-                    break
+            if section_name not in copied:
+                setattr(result, section_name, copy.copy(getattr(result, section_name)))
+                copied.add(section_name)
+            setattr(getattr(result, section_name), key, value)
         
         return result
     
@@ -292,25 +466,14 @@ class Config:
         errors = []
         
         # Check required LLM parameters
-        required_llm_fields = [
-            ('api_key', 'LLM API key'),
-            ('model', 'LLM model'),
-            ('base_url', 'LLM base URL'),
-        ]
-        
-        for field_name, display_name in required_llm_fields:
-            value = getattr(self.llm, field_name)
+        for getter, message in _REQUIRED_LLM_RULES:
+            value = getter(self)
             if value is None or (isinstance(value, str) and value.strip() == ""):
-                errors.append(
-                    f"{display_name} is required. "
-                    f"Set it via --{field_name.replace('_', '-')} flag, "
-                    f"{field_name.upper().replace('MODEL', 'LLM_MODEL')} environment variable, "
-                    f"or config file."
-                )
+                errors.append(message)
         
         # Check value range validations
-        for section_name, field, check, msg in VALIDATIONS:
-            value = getattr(getattr(self, section_name), field)
+        for getter, check, msg in _VALIDATION_RULES:
+            value = getter(self)
             if value is not None and not check(value):
                 errors.append(f"{msg}, got {value}")
         
@@ -2,15 +2,124 @@
 Agent Configuration - Agent profiles and management
 """
 
-import re
-from dataclasses import dataclass
+import os
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict, Tuple
 
+import yaml
+
+from codefuse import _json
 from codefuse.observability import mainLogger
 
 
-@dataclass
+# On-disk cache of parsed user agent profiles (plain JSON), keyed by file path
+# and mtime. Entries whose fields no longer match AgentProfile are dropped on
+# read; bump the version only when parsing changes.
+PROFILE_CACHE_PATH = "~/.cfuse/cache/agent_profiles.json"
+PROFILE_CACHE_VERSION = 1
+
+# libyaml-backed loader when PyYAML was built with it
+_YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _end_of_delimiter(content: str, start: int) -> int:
+    """
+    Get the index just past a '---' delimiter's line break
+    
+    ``start`` points after the dashes; the whitespace that follows must
+    contain a newline, and the text resumes after the last one. Returns -1
+    if there is none.
+    """
+    end = start
+    while end < len(content) and content[end].isspace():
+        end += 1
+    newline = content.rfind('\n', start, end)
+    return newline + 1 if newline >= 0 else -1
+
+
+def _split_frontmatter(content: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a '---' delimited frontmatter block from the body
+    
+    Plain string scanning with the same result as matching
+    ``^---\\s*\\n(.*?)\\n---\\s*\\n(.*)$`` (DOTALL), up to surrounding
+    whitespace of the frontmatter, which callers strip.
+    
+    Returns:
+        (frontmatter, body) or None if there is no frontmatter block
+    """
+    if not content.startswith('---'):
+        return None
+    fm_start = _end_of_delimiter(content, 3)
+    if fm_start < 0:
+        return None
+    
+    close = content.find('\n---', fm_start)
+    while close >= 0:
+        body_start = _end_of_delimiter(content, close + 4)
+        if body_start >= 0:
+            return content[fm_start:close], content[body_start:]
+        close = content.find('\n---', close + 1)
+    
+    # An empty block: the opening whitespace spans several lines and its
+    # last line break starts the closing delimiter ('---\n\n---\n...')
+    if content.rfind('\n', 3, fm_start - 1) >= 0 and content.startswith('---', fm_start):
+        body_start = _end_of_delimiter(content, fm_start + 3)
+        if body_start >= 0:
+            return '', content[body_start:]
+    return None
+
+
+def _frontmatter_value(value: object) -> Optional[str]:
+    """Normalize a scalar frontmatter value; null-like values become None"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.lower() in ('null', 'none', ''):
+        return None
+    return value
+
+
+def _parse_frontmatter_lines(frontmatter_str: str) -> Dict[str, Optional[str]]:
+    """Parse 'key: value' lines (fallback for frontmatter that is not valid YAML)"""
+    frontmatter = {}
+    for line in frontmatter_str.strip().split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            
+            # Remove comments
+            if '#' in value:
+                value = value.split('#')[0]
+            
+            frontmatter[key.strip()] = _frontmatter_value(value)
+    return frontmatter
+
+
+def _parse_frontmatter(frontmatter_str: str) -> Dict[str, object]:
+    """
+    Parse frontmatter as YAML
+    
+    Scalars are normalized to strings (or None) and lists to lists of
+    strings. Text that is not a YAML mapping falls back to line parsing.
+    """
+    try:
+        data = yaml.load(frontmatter_str, Loader=_YAMLLoader)
+    except yaml.YAMLError:
+        data = None
+    if not isinstance(data, dict):
+        return _parse_frontmatter_lines(frontmatter_str)
+    
+    frontmatter: Dict[str, object] = {}
+    for key, value in data.items():
+        if isinstance(value, list):
+            frontmatter[str(key)] = [str(item) for item in value if item is not None]
+        else:
+            frontmatter[str(key)] = _frontmatter_value(value)
+    return frontmatter
+
+
+@dataclass(slots=True)
 class AgentProfile:
     """
     Agent profile defining behavior, tools, and model
@@ -54,32 +163,56 @@ class AgentProfile:
         content = file_path.read_text(encoding='utf-8')
         
         # Parse YAML frontmatter and content
-        frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n(.*)$'
-        match = re.match(frontmatter_pattern, content, re.DOTALL)
+        parts = _split_frontmatter(content)
         
-        if not match:
+        if parts is None:
             raise ValueError(f"Invalid agent profile format in {path} (missing frontmatter)")
         
-        frontmatter_str = match.group(1)
-        system_prompt = match.group(2).strip()
-        
-        # Parse frontmatter (simple YAML parsing)
-        frontmatter = {}
-        for line in frontmatter_str.strip().split('\n'):
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Remove comments
-                if '#' in value:
-                    value = value.split('#')[0].strip()
-                
-                # Handle null/None values
-                if value.lower() in ('null', 'none', ''):
-                    value = None
-                
-                frontmatter[key] = value
+        frontmatter_str, system_prompt = parts
+        profile = cls._from_frontmatter(frontmatter_str, system_prompt.strip(), path)
+        
+        mainLogger.info("Loaded agent profile", name=profile.name, path=str(path))
+        
+        return profile
+    
+    @classmethod
+    def load_header(cls, path: str) -> Optional["AgentProfile"]:
+        """
+        Load only the frontmatter of an agent profile, leaving the body unread
+        
+        Lines are read until the closing '---' delimiter.
+        
+        Args:
+            path: Path to the Markdown file
+            
+        Returns:
+            AgentProfile with system_prompt=None, or None if the file has no
+            complete frontmatter block
+        
+        Raises:
+            ValueError: If the frontmatter has no 'name' field
+        """
+        lines: List[str] = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not lines and not line.startswith('---'):
+                    return None
+                lines.append(line)
+                if len(lines) > 1 and line.startswith('---'):
+                    parts = _split_frontmatter(''.join(lines))
+                    if parts is not None:
+                        return cls._from_frontmatter(parts[0], None, path)
+        return None
+    
+    @classmethod
+    def _from_frontmatter(
+        cls,
+        frontmatter_str: str,
+        system_prompt: Optional[str],
+        path: str,
+    ) -> "AgentProfile":
+        """Build a profile from raw frontmatter text and the (stripped) body"""
+        frontmatter = _parse_frontmatter(frontmatter_str)
         
         # Extract fields
         name = frontmatter.get('name')
@@ -88,19 +221,19 @@ class AgentProfile:
         
         description = frontmatter.get('description', '')
         
-        # Parse tools (comma-separated list or None)
-        tools_str = frontmatter.get('tools')
+        # Parse tools (YAML list, comma-separated string or None)
+        tools_value = frontmatter.get('tools')
         tools = None
-        if tools_str:
-            tools = [t.strip() for t in tools_str.split(',') if t.strip()]
+        if tools_value:
+            if isinstance(tools_value, str):
+                tools_value = tools_value.split(',')
+            tools = [t.strip() for t in tools_value if t.strip()]
         
         # Parse model
         model = frontmatter.get('model')
         if model and model.lower() in ('inherit', 'default'):
             model = None
         
-        mainLogger.info("Loaded agent profile", name=name, path=str(path))
-        
         return cls(
             name=name,
             description=description,
@@ -189,15 +322,28 @@ class AgentProfileManager:
     Loads built-in and user-defined agent profiles from disk.
     """
     
-    def __init__(self, agent_dir: str = "~/.cfuse/agents"):
+    def __init__(
+        self,
+        agent_dir: str = "~/.cfuse/agents",
+        use_cache: bool = True,
+        cache_path: str = PROFILE_CACHE_PATH,
+    ):
         """
         Initialize agent profile manager
         
         Args:
             agent_dir: Directory containing user-defined agent profiles
+            use_cache: Reuse parsed profiles from the on-disk cache when the
+                       source file's mtime is unchanged
+            cache_path: Location of the on-disk profile cache
         """
         self.agent_dir = Path(agent_dir).expanduser()
+        self.use_cache = use_cache
+        self.cache_path = Path(cache_path).expanduser()
         self._profiles: Dict[str, AgentProfile] = {}
+        # Profiles with only their header loaded: name -> (path, mtime_ns, header)
+        self._pending: Dict[str, Tuple[str, int, AgentProfile]] = {}
+        self._cache_entries: Dict[str, Tuple[int, AgentProfile]] = {}
         
         # Load built-in agent
         self._load_builtin_agent()
@@ -205,7 +351,10 @@ class AgentProfileManager:
         # Load user agents
         self._load_user_agents()
         
-        mainLogger.info("AgentProfileManager initialized", profile_count=len(self._profiles))
+        mainLogger.info(
+            "AgentProfileManager initialized",
+            profile_count=len(self._profiles) + len(self._pending),
+        )
     
     def _load_builtin_agent(self) -> None:
         """Load the built-in default agent"""
@@ -214,19 +363,100 @@ class AgentProfileManager:
         mainLogger.debug("Loaded built-in default agent")
     
     def _load_user_agents(self) -> None:
-        """Load user-defined agents from agent_dir"""
-        if not self.agent_dir.exists():
+        """
+        Load user-defined agents from agent_dir
+        
+        Profiles in the on-disk cache are used as-is. Other files only have
+        their frontmatter read (AgentProfile.load_header), which is enough
+        for listing and get_agent_info(); the full parse is deferred to
+        get_agent(). Files without a complete header are parsed right away.
+        """
+        try:
+            # One directory read; the file-type check uses the cached dirent
+            with os.scandir(self.agent_dir) as it:
+                md_entries = [e for e in it if e.name.endswith(".md") and e.is_file()]
+        except (FileNotFoundError, NotADirectoryError):
             mainLogger.debug("Agent directory does not exist", agent_dir=str(self.agent_dir))
             return
         
-        # Look for .md files
-        for file_path in self.agent_dir.glob("*.md"):
+        cached = self._read_cache() if self.use_cache else {}
+        fresh: Dict[str, Tuple[int, AgentProfile]] = {}
+        
+        for dir_entry in md_entries:
+            path_str = dir_entry.path
             try:
-                agent = AgentProfile.from_markdown(str(file_path))
+                mtime_ns = dir_entry.stat().st_mtime_ns
+                entry = cached.get(path_str)
+                if entry is not None and entry[0] == mtime_ns:
+                    agent = entry[1]
+                else:
+                    header = AgentProfile.load_header(path_str)
+                    if header is not None:
+                        # Later files win, as with eager loading
+                        self._pending[header.name] = (path_str, mtime_ns, header)
+                        mainLogger.debug("Found user agent", name=header.name, path=path_str)
+                        continue
+                    agent = AgentProfile.from_markdown(path_str)
+                fresh[path_str] = (mtime_ns, agent)
+                self._pending.pop(agent.name, None)
                 self._profiles[agent.name] = agent
                 mainLogger.info("Loaded user agent", name=agent.name)
             except Exception as e:
-                mainLogger.error("Failed to load agent", path=str(file_path), error=str(e))
+                mainLogger.error("Failed to load agent", path=path_str, error=str(e))
+        
+        self._cache_entries = fresh
+        if self.use_cache and fresh != cached:
+            self._write_cache(fresh)
+    
+    def _load_pending_agent(self, name: str) -> None:
+        """Parse a deferred profile and add it to the cache"""
+        path_str, mtime_ns, _ = self._pending.pop(name)
+        try:
+            agent = AgentProfile.from_markdown(path_str)
+        except Exception as e:
+            mainLogger.error("Failed to load agent", path=path_str, error=str(e))
+            return
+        
+        self._profiles[agent.name] = agent
+        mainLogger.info("Loaded user agent", name=agent.name)
+        self._cache_entries[path_str] = (mtime_ns, agent)
+        if self.use_cache:
+            self._write_cache(self._cache_entries)
+    
+    def _read_cache(self) -> Dict[str, Tuple[int, AgentProfile]]:
+        """Read the on-disk profile cache (empty on miss, version mismatch or corruption)"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data: Any = _json.loads(f.read())
+            if data.get("version") != PROFILE_CACHE_VERSION:
+                return {}
+            return {
+                path_str: (int(mtime_ns), AgentProfile(**fields))
+                for path_str, (mtime_ns, fields) in data["entries"].items()
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            mainLogger.debug("Ignoring unreadable agent profile cache", error=str(e))
+        return {}
+    
+    def _write_cache(self, entries: Dict[str, Tuple[int, AgentProfile]]) -> None:
+        """Persist parsed profiles so the next process can skip re-parsing"""
+        data = {
+            "version": PROFILE_CACHE_VERSION,
+            "entries": {
+                path_str: [mtime_ns, asdict(agent)]
+                for path_str, (mtime_ns, agent) in entries.items()
+            },
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(_json.dumps(data))
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            mainLogger.debug("Failed to write agent profile cache", error=str(e))
     
     def get_agent(self, name: str) -> Optional[AgentProfile]:
         """
@@ -238,6 +468,8 @@ class AgentProfileManager:
         Returns:
             AgentProfile if found, None otherwise
         """
+        if name in self._pending:
+            self._load_pending_agent(name)
         return self._profiles.get(name)
     
     def list_agents(self) -> List[str]:
@@ -247,7 +479,7 @@ class AgentProfileManager:
         Returns:
             List of agent names
         """
-        return list(self._profiles.keys())
+        return list(dict.fromkeys([*self._profiles, *self._pending]))
     
     def get_agent_info(self, name: str) -> Optional[str]:
         """
@@ -259,7 +491,9 @@ class AgentProfileManager:
         Returns:
             Formatted string with agent info, or None if not found
         """
-        agent = self.get_agent(name)
+        # Header-only profiles carry every field shown here
+        pending = self._pending.get(name)
+        agent = pending[2] if pending else self.get_agent(name)
         if not agent:
             return None
         
@@ -2,6 +2,10 @@
 Agent Loop - Main agent execution loop with tool calling
 """
 
+import io
+import queue
+import threading
+import time
 from dataclasses import dataclass
 from typing import Iterator, List, Optional, Literal, Any, Callable, Union
 
@@ -12,7 +16,72 @@ from codefuse.core.tool_executor import ToolExecutor
 from codefuse.observability import MetricsCollector, mainLogger
 
 
-@dataclass
+_STREAM_IDLE = object()
+
+
+class _StreamPump:
+    """
+    Reads an LLM stream on a background thread
+    
+    Lets the consumer wait for the next chunk with a timeout, so text held
+    for coalescing is released while the model pauses. The provider stream
+    cannot be closed from another thread, so a consumer that stops early
+    leaves the reader pulling the response until its next chunk arrives,
+    which may be the end of the stream; hence coalescing is opt-in.
+    """
+    
+    _END = object()
+    
+    def __init__(self, stream: Iterator[Any]):
+        self._queue: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, args=(stream,), daemon=True, name="LLMStreamPump"
+        )
+        self._thread.start()
+    
+    def _run(self, stream: Iterator[Any]) -> None:
+        try:
+            for chunk in stream:
+                if self._stop.is_set():
+                    break
+                self._queue.put(chunk)
+        except BaseException as e:
+            self._error = e
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            self._queue.put(self._END)
+    
+    def get(self, timeout: Optional[float]) -> Any:
+        """
+        Get the next chunk
+        
+        Returns:
+            The chunk, None at the end of the stream, or _STREAM_IDLE if
+            nothing arrived within timeout
+        
+        Raises:
+            Whatever the stream raised
+        """
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return _STREAM_IDLE
+        if item is self._END:
+            if self._error is not None:
+                raise self._error
+            return None
+        return item
+    
+    def close(self) -> None:
+        """Stop reading after the chunk in flight (the reader closes the stream)"""
+        self._stop.set()
+
+
+@dataclass(slots=True)
 class AgentEvent:
     """
     Event emitted by the agent loop
@@ -44,6 +113,11 @@ class AgentLoop:
     - Streaming output
     """
     
+    # When coalescing is enabled, streamed deltas are held until this many
+    # characters are pending (or chunk_coalesce_ms has passed since the last
+    # llm_chunk event)
+    CHUNK_COALESCE_CHARS = 64
+    
     def __init__(
         self,
         llm: BaseLLM,
@@ -57,6 +131,7 @@ class AgentLoop:
         remote_tool_url: Optional[str] = None,
         remote_tool_instance_id: Optional[str] = None,
         remote_tool_timeout: int = 60,
+        chunk_coalesce_ms: float = 0.0,
     ):
         """
         Initialize agent loop
@@ -74,6 +149,11 @@ class AgentLoop:
             remote_tool_url: URL of remote tool service
             remote_tool_instance_id: Instance ID for remote execution
             remote_tool_timeout: Timeout for remote tool calls in seconds
+            chunk_coalesce_ms: Window for merging streamed deltas into one
+                               llm_chunk event (0, the default, emits every
+                               delta and reads the stream on the caller's
+                               thread; otherwise a reader thread is used, which
+                               keeps draining a stream abandoned mid-response)
         """
         self.llm = llm
         self.tool_registry = tool_registry
@@ -82,6 +162,12 @@ class AgentLoop:
         self.yolo_mode = yolo_mode
         self.confirmation_callback = confirmation_callback
         self.metrics_collector = metrics_collector
+        self._metrics_enabled = metrics_collector is not None
+        self._chunk_coalesce_s = max(0.0, chunk_coalesce_ms) / 1000
+        
+        # Tool schemas sent to the LLM, rebuilt only when the registry changes
+        self._tools_cached = self.context_engine.get_tools_for_llm()
+        self._tools_version = tool_registry.version
         
         # Initialize tool executor
         self.tool_executor = ToolExecutor(
@@ -109,27 +195,33 @@ class AgentLoop:
         """Get session ID from context engine"""
         return self.context_engine.session_id
     
-    def _build_llm_done_event_data(self, llm_response) -> dict:
+    def _build_llm_done_event_data(
+        self, llm_response, tool_calls_dicts: Optional[List[dict]] = None
+    ) -> dict:
         """
         Build llm_done event data from LLM response
         
         Args:
             llm_response: LLM response object
+            tool_calls_dicts: Tool calls already in event form (built while
+                streaming); derived from llm_response when omitted
             
         Returns:
             Dictionary with event data
         """
-        return {
-            "content": llm_response.content,
-            "has_tool_calls": llm_response.has_tool_calls,
-            "tool_calls": [
+        if tool_calls_dicts is None:
+            tool_calls_dicts = [
                 {
                     "id": tc.id,
                     "type": tc.type,
                     "function": tc.function,
                 }
                 for tc in llm_response.tool_calls
-            ] if llm_response.tool_calls else [],
+            ] if llm_response.tool_calls else []
+        return {
+            "content": llm_response.content,
+            "has_tool_calls": llm_response.has_tool_calls,
+            "tool_calls": tool_calls_dicts,
             "session_id": self.session_id,
         }
     
@@ -171,19 +263,17 @@ class AgentLoop:
             Query summary string
         """
         if isinstance(user_query, str):
-            return user_query[:100] if len(user_query) > 100 else user_query
-        else:
-            # Multimodal content
-            text_parts = [
-                block.text for block in user_query 
-                if block.type == "text" and block.text
-            ]
-            image_count = sum(
-                1 for block in user_query 
-                if block.type == "image_url"
-            )
-            text_preview = text_parts[0][:50] if text_parts else ""
-            return f"{text_preview}... [{image_count} image(s)]"
+            return user_query[:100]
+        
+        # Multimodal content: first text preview and image count in one pass
+        text_preview = ""
+        image_count = 0
+        for block in user_query:
+            if block.type == "image_url":
+                image_count += 1
+            elif not text_preview and block.type == "text" and block.text:
+                text_preview = block.text[:50]
+        return f"{text_preview}... [{image_count} image(s)]"
     
     def _call_llm(self, messages: List[Message], tools: List, stream: bool):
         """
@@ -200,7 +290,7 @@ class AgentLoop:
         """
         if not stream:
             # Non-streaming: call directly and record metrics
-            if self.metrics_collector:
+            if self._metrics_enabled:
                 with self.metrics_collector.track_api_call() as api_tracker:
                     llm_response = self.llm.generate(
                         messages=messages,
@@ -253,7 +343,7 @@ class AgentLoop:
         # 3. Setup metrics tracking
         prompt_tracker_ctx = None
         prompt_tracker = None
-        if self.metrics_collector:
+        if self._metrics_enabled:
             prompt_tracker_ctx = self.metrics_collector.track_prompt(user_query)
             prompt_tracker = prompt_tracker_ctx.__enter__()
         
@@ -277,7 +367,10 @@ class AgentLoop:
                 
                 # Get current messages and tools from context engine
                 messages = self.context_engine.get_messages_for_llm()
-                tools = self.context_engine.get_tools_for_llm()
+                if self.tool_registry.version != self._tools_version:
+                    self._tools_cached = self.context_engine.get_tools_for_llm()
+                    self._tools_version = self.tool_registry.version
+                tools = self._tools_cached
                 
                 try:
                     # Send LLM start event
@@ -314,13 +407,12 @@ class AgentLoop:
                         final_response = llm_response.content
                         break
                     
-                    # Execute tool calls
-                    for tool_call in llm_response.tool_calls:
-                        result_events = self.tool_executor.execute_tool_call(
-                            tool_call, self.session_id
-                        )
-                        for tool_event in result_events:
-                            yield AgentEvent(type=tool_event.type, data=tool_event.data)
+                    # Execute tool calls (consecutive read-only calls run concurrently)
+                    result_events = self.tool_executor.execute_tool_calls(
+                        llm_response.tool_calls, self.session_id
+                    )
+                    for tool_event in result_events:
+                        yield AgentEvent(type=tool_event.type, data=tool_event.data)
                     
                 except Exception as e:
                     mainLogger.error(
@@ -383,13 +475,17 @@ class AgentLoop:
         """
         from codefuse.llm.base import LLMResponse
         
-        content_parts = []
+        content_buf = io.StringIO()
         tool_calls = []
+        tool_calls_dicts = []  # Event form, built as calls arrive
         usage = None
         finish_reason = ""
         
+        stream = None
+        pump: Optional[_StreamPump] = None
+        
         # Track API call if metrics collector is available
-        if self.metrics_collector:
+        if self._metrics_enabled:
             api_tracker_ctx = self.metrics_collector.track_api_call()
             api_tracker = api_tracker_ctx.__enter__()
         else:
@@ -400,20 +496,64 @@ class AgentLoop:
             # Get streaming generator using unified method
             stream = self._call_llm(messages, tools, stream=True)
             
-            # Process chunks
-            for chunk in stream:
-                if chunk.type == "content":
-                    content_parts.append(chunk.delta)
-                    yield AgentEvent(type="llm_chunk", data={"delta": chunk.delta})
-                elif chunk.type == "tool_call":
-                    tool_calls.append(chunk.tool_call)
-                elif chunk.type == "done":
-                    usage = chunk.usage
-                    finish_reason = chunk.finish_reason
+            # Process chunks, coalescing deltas that arrive in quick succession
+            # when enabled. Coalescing reads the stream on a background thread
+            # so held text is released when the window expires, even if the
+            # model pauses (e.g. while it generates tool call arguments).
+            window = self._chunk_coalesce_s
+            if window > 0:
+                pump = _StreamPump(stream)
+            else:
+                chunks = iter(stream)
+            pending: List[str] = []
+            pending_chars = 0
+            last_flush = 0.0
+            while True:
+                if window > 0:
+                    timeout = max(0.0, last_flush + window - time.monotonic()) if pending else None
+                    chunk = pump.get(timeout)
+                else:
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                
+                if chunk is _STREAM_IDLE:
+                    flush = True
+                elif chunk.type == "content":
+                    delta = chunk.delta
+                    content_buf.write(delta)
+                    pending.append(delta)
+                    pending_chars += len(delta)
+                    flush = (
+                        pending_chars >= self.CHUNK_COALESCE_CHARS
+                        or time.monotonic() - last_flush >= window
+                    )
+                else:
+                    flush = True
+                    if chunk.type == "tool_call":
+                        tool_call = chunk.tool_call
+                        tool_calls.append(tool_call)
+                        tool_calls_dicts.append({
+                            "id": tool_call.id,
+                            "type": tool_call.type,
+                            "function": tool_call.function,
+                        })
+                    elif chunk.type == "done":
+                        usage = chunk.usage
+                        finish_reason = chunk.finish_reason
+                
+                if flush and pending:
+                    yield AgentEvent(type="llm_chunk", data={"delta": "".join(pending)})
+                    pending = []
+                    pending_chars = 0
+                    last_flush = time.monotonic()
+            
+            if pending:
+                yield AgentEvent(type="llm_chunk", data={"delta": "".join(pending)})
             
             # Reconstruct LLMResponse
             response = LLMResponse(
-                content="".join(content_parts),
+                content=content_buf.getvalue(),
                 tool_calls=tool_calls,
                 usage=usage,
                 model=self.llm.model,
@@ -421,16 +561,22 @@ class AgentLoop:
             )
             
             # Use unified metrics recording
-            self._record_llm_metrics(api_tracker, response)
+            if self._metrics_enabled:
+                self._record_llm_metrics(api_tracker, response)
             
             # Use unified event construction
             yield AgentEvent(
                 type="llm_done",
-                data=self._build_llm_done_event_data(response)
+                data=self._build_llm_done_event_data(response, tool_calls_dicts)
             )
             
             return response
         
         finally:
+            if pump is not None:
+                pump.close()
+            elif stream is not None and hasattr(stream, "close"):
+                # Abandoned mid-response: stop the transfer now, not on GC
+                stream.close()
             if api_tracker_ctx:
                 api_tracker_ctx.__exit__(None, None, None)
@@ -17,12 +17,12 @@ from uuid import uuid4
 from codefuse.llm.base import Message, MessageRole, LLMResponse, ToolCall, Tool as LLMTool, ContentBlock
 from codefuse.core.environment import EnvironmentInfo
 from codefuse.observability import mainLogger
+from codefuse.observability.llm_messages import LLMMessagesWriter
 from codefuse.core.agent_config import AgentProfile
 
 if TYPE_CHECKING:
     from codefuse.tools.registry import ToolRegistry
     from codefuse.observability.trajectory import TrajectoryWriter
-    from codefuse.observability.llm_messages import LLMMessagesWriter
     from codefuse.llm.base import BaseLLM
 
 
@@ -537,6 +537,8 @@ class ContextEngine:
         
         This method reads a saved llm_messages.json file and extracts the
         conversation history (user and assistant messages, excluding system messages).
+        If the session was interrupted before the snapshot was materialized,
+        the history is rebuilt from the llm_messages.jsonl journal instead.
         
         Args:
             llm_messages_file: Path to the llm_messages.json file
@@ -548,12 +550,12 @@ class ContextEngine:
             FileNotFoundError: If the file doesn't exist
             ValueError: If the file format is invalid
         """
-        if not llm_messages_file.exists():
+        journal_file = LLMMessagesWriter.journal_path_for(llm_messages_file)
+        if not llm_messages_file.exists() and not journal_file.exists():
             raise FileNotFoundError(f"LLM messages file not found: {llm_messages_file}")
         
         try:
-            with open(llm_messages_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = LLMMessagesWriter.read_snapshot(llm_messages_file)
             
             # Extract messages from the snapshot
             if 'messages' not in data:
@@ -561,6 +563,7 @@ class ContextEngine:
             
             messages_data = data['messages']
             conversation_history = []
+            roles = {role.value: role for role in MessageRole}
             
             for msg_data in messages_data:
                 role_str = msg_data.get('role')
@@ -570,35 +573,13 @@ class ContextEngine:
                     continue
                 
                 # Parse role
-                try:
-                    role = MessageRole(role_str)
-                except ValueError:
+                role = roles.get(role_str)
+                if role is None:
                     mainLogger.warning(f"Unknown message role: {role_str}, skipping")
                     continue
                 
-                # Parse content
-                content = msg_data.get('content', '')
-                
-                # Parse tool_calls if present
-                tool_calls = None
-                if 'tool_calls' in msg_data and msg_data['tool_calls']:
-                    tool_calls = [
-                        ToolCall(
-                            id=tc.get('id', ''),
-                            type=tc.get('type', 'function'),
-                            function=tc.get('function', {}),
-                        )
-                        for tc in msg_data['tool_calls']
-                    ]
-                
-                # Create message
-                message = Message(
-                    role=role,
-                    content=content,
-                    name=msg_data.get('name'),
-                    tool_calls=tool_calls,
-                    tool_call_id=msg_data.get('tool_call_id'),
-                )
+                # File was written by LLMMessagesWriter, so skip per-field construction
+                message = Message._from_trusted_dict(msg_data, role)
                 conversation_history.append(message)
             
             mainLogger.info(
@@ -4,7 +4,8 @@ Tool Executor - Handles tool call execution with confirmation and error handling
 
 import json
 import time
-from typing import Iterator, Optional, Callable, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Callable, Any, List, Tuple
 from dataclasses import dataclass
 
 from codefuse.llm.base import ToolCall
@@ -14,7 +15,7 @@ from codefuse.core.context_engine import ContextEngine
 from codefuse.observability import MetricsCollector, mainLogger
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolExecutionEvent:
     """
     Event emitted during tool execution
@@ -55,6 +56,7 @@ class ToolExecutor:
         remote_url: Optional[str] = None,
         remote_instance_id: Optional[str] = None,
         remote_timeout: int = 60,
+        max_parallel_tools: int = 8,
     ):
         """
         Initialize tool executor
@@ -70,6 +72,7 @@ class ToolExecutor:
             remote_url: URL of remote tool service
             remote_instance_id: Instance ID for remote execution
             remote_timeout: Timeout for remote tool calls in seconds
+            max_parallel_tools: Maximum read-only tool calls run concurrently
         """
         self.tool_registry = tool_registry
         self.context_engine = context_engine
@@ -80,6 +83,7 @@ class ToolExecutor:
         self.remote_url = remote_url
         self.remote_instance_id = remote_instance_id
         self.remote_timeout = remote_timeout
+        self.max_parallel_tools = max(1, max_parallel_tools)
         
         # Initialize remote tool executor if enabled
         self.remote_executor = None
@@ -102,6 +106,96 @@ class ToolExecutor:
                 remote_instance_id=self.remote_instance_id,
             )
     
+    def execute_tool_calls(
+        self,
+        tool_calls: List[ToolCall],
+        session_id: str,
+    ) -> Iterator[ToolExecutionEvent]:
+        """
+        Execute the tool calls of one LLM turn
+        
+        Runs of consecutive calls to read-only tools (see
+        BaseTool.is_read_only) that need no confirmation execute concurrently;
+        every other call runs on its own, in order. Results are recorded in
+        the context and tool_done events emitted in tool call order.
+        
+        Args:
+            tool_calls: Tool calls from the LLM response
+            session_id: Session ID
+            
+        Yields:
+            ToolExecutionEvent objects for tool execution progress
+        """
+        batch: List[Tuple[Any, str, str, dict]] = []
+        for tool_call in tool_calls:
+            prepared = self._prepare_concurrent_call(tool_call)
+            if prepared is not None:
+                batch.append(prepared)
+                continue
+            if batch:
+                yield from self._execute_batch(batch, session_id)
+                batch = []
+            yield from self.execute_tool_call(tool_call, session_id)
+        if batch:
+            yield from self._execute_batch(batch, session_id)
+    
+    def _prepare_concurrent_call(
+        self, tool_call: ToolCall
+    ) -> Optional[Tuple[Any, str, str, dict]]:
+        """
+        Resolve a call that may run concurrently with its neighbours
+        
+        Returns:
+            (tool, tool_call_id, tool_name, arguments), or None if the call
+            must take the sequential path (unknown tool, invalid arguments,
+            side effects or confirmation needed)
+        """
+        tool_name = tool_call.function["name"]
+        tool = self.tool_registry.get_tool(tool_name)
+        if tool is None or not tool.is_read_only:
+            return None
+        if tool.requires_confirmation and not self.yolo_mode:
+            return None
+        try:
+            arguments = json.loads(tool_call.function["arguments"])
+        except json.JSONDecodeError:
+            return None
+        return tool, tool_call.id, tool_name, arguments
+    
+    def _execute_batch(
+        self, batch: List[Tuple[Any, str, str, dict]], session_id: str
+    ) -> Iterator[ToolExecutionEvent]:
+        """Execute prepared read-only calls concurrently, recording results in order"""
+        if len(batch) == 1:
+            tool, tool_call_id, tool_name, arguments = batch[0]
+            yield from self._execute_and_record(
+                tool, tool_call_id, tool_name, arguments, True, session_id
+            )
+            return
+        
+        for _, tool_call_id, tool_name, arguments in batch:
+            yield self._tool_start_event(tool_call_id, tool_name, arguments, session_id)
+        
+        # Metrics are registered here, on the calling thread, so they keep
+        # tool call order whatever order the calls complete in
+        trackings = [
+            self._track_tool_call(tool_call_id, tool_name, arguments)
+            for _, tool_call_id, tool_name, arguments in batch
+        ]
+        
+        workers = min(len(batch), self.max_parallel_tools)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ToolCall") as pool:
+            futures = [
+                pool.submit(self._run_tool, tool, tool_call_id, tool_name, arguments, session_id, tracking)
+                for (tool, tool_call_id, tool_name, arguments), tracking in zip(batch, trackings)
+            ]
+            for (_, tool_call_id, tool_name, arguments), future in zip(batch, futures):
+                tool_result, success, duration = future.result()
+                yield self._record_result(
+                    tool_call_id, tool_name, arguments, True, session_id,
+                    tool_result, success, duration,
+                )
+    
     def execute_tool_call(
         self,
         tool_call: ToolCall,
@@ -268,7 +362,23 @@ class ToolExecutor:
     ) -> Iterator[ToolExecutionEvent]:
         """Execute tool and record result"""
         # Emit tool start event
-        yield ToolExecutionEvent(
+        yield self._tool_start_event(tool_call_id, tool_name, arguments, session_id)
+        
+        tool_result, success, duration = self._run_tool(
+            tool, tool_call_id, tool_name, arguments, session_id
+        )
+        
+        yield self._record_result(
+            tool_call_id, tool_name, arguments, confirmed, session_id,
+            tool_result, success, duration,
+        )
+    
+    @staticmethod
+    def _tool_start_event(
+        tool_call_id: str, tool_name: str, arguments: dict, session_id: str
+    ) -> ToolExecutionEvent:
+        """Build the tool_start event"""
+        return ToolExecutionEvent(
             type="tool_start",
             data={
                 "tool_call_id": tool_call_id,
@@ -277,18 +387,43 @@ class ToolExecutor:
                 "session_id": session_id,
             }
         )
+    
+    def _track_tool_call(
+        self, tool_call_id: str, tool_name: str, arguments: dict
+    ) -> Tuple[Any, Any]:
+        """
+        Start tracking a tool call with the metrics collector, if available
+        
+        Returns:
+            (tracker context, tracker), or (None, None) without a collector
+        """
+        if not self.metrics_collector:
+            return None, None
+        tool_tracker_ctx = self.metrics_collector.track_tool_call(
+            tool_name=tool_name,
+            tool_call_id=tool_call_id,
+            arguments=arguments,
+        )
+        return tool_tracker_ctx, tool_tracker_ctx.__enter__()
+    
+    def _run_tool(
+        self, tool: Any, tool_call_id: str, tool_name: str,
+        arguments: dict, session_id: str,
+        tracking: Optional[Tuple[Any, Any]] = None,
+    ) -> Tuple[ToolResult, bool, float]:
+        """
+        Execute a tool with metrics tracking
+        
+        Safe to call from worker threads when tracking was started on the
+        calling thread (see _track_tool_call).
         
+        Returns:
+            (tool_result, success, duration in seconds)
+        """
         # Track tool execution with metrics if available
-        if self.metrics_collector:
-            tool_tracker_ctx = self.metrics_collector.track_tool_call(
-                tool_name=tool_name,
-                tool_call_id=tool_call_id,
-                arguments=arguments,
-            )
-            tool_tracker = tool_tracker_ctx.__enter__()
-        else:
-            tool_tracker_ctx = None
-            tool_tracker = None
+        if tracking is None:
+            tracking = self._track_tool_call(tool_call_id, tool_name, arguments)
+        tool_tracker_ctx, tool_tracker = tracking
         
         # Execute tool and track duration
         start_time = time.time()
@@ -351,6 +486,13 @@ class ToolExecutor:
             if tool_tracker_ctx:
                 tool_tracker_ctx.__exit__(None, None, None)
         
+        return tool_result, success, duration
+    
+    def _record_result(
+        self, tool_call_id: str, tool_name: str, arguments: dict, confirmed: bool,
+        session_id: str, tool_result: ToolResult, success: bool, duration: float,
+    ) -> ToolExecutionEvent:
+        """Add a tool result to the context and build the tool_done event"""
         # Add tool result to context (automatically writes to trajectory)
         self.context_engine.add_tool_result(
             tool_call_id=tool_call_id,
@@ -362,7 +504,7 @@ class ToolExecutor:
         )
         
         # Emit tool done event (display for user)
-        yield ToolExecutionEvent(
+        return ToolExecutionEvent(
             type="tool_done",
             data={
                 "tool_call_id": tool_call_id,
@@ -0,0 +1,65 @@
+"""
+HTTP Client Pool - Shares httpx clients between LLM instances
+
+LLM instances created for the same endpoint and credentials reuse one
+httpx.Client, so repeated agent runs keep their warm TCP/TLS connections
+instead of paying a new handshake per instance.
+"""
+
+import atexit
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+_clients: Dict[Tuple[str, Optional[str], str], httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def get_client(
+    provider: str,
+    base_url: Optional[str],
+    api_key: str,
+    timeout: float,
+) -> httpx.Client:
+    """
+    Get the shared HTTP client for an endpoint, creating it on first use
+
+    Args:
+        provider: LLM provider type
+        base_url: Base URL for API endpoint
+        api_key: API key (only its hash is kept, to separate credentials)
+        timeout: Default request timeout in seconds (the SDK sets per-request timeouts)
+
+    Returns:
+        httpx.Client shared by all callers with the same key
+    """
+    key = (provider, base_url, hashlib.sha256((api_key or "").encode()).hexdigest())
+    client = _clients.get(key)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                timeout=timeout,
+                limits=httpx.Limits(max_keepalive_connections=32),
+                follow_redirects=True,
+            )
+            _clients[key] = client
+        return client
+
+
+def close_clients() -> None:
+    """Close and forget all pooled clients (registered to run at exit)"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+atexit.register(close_clients)
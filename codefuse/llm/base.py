@@ -30,9 +30,18 @@ class ToolCall:
     id: str
     type: str  # "function"
     function: Dict[str, str]  # {"name": str, "arguments": str (JSON)}
+    
+    @classmethod
+    def _from_trusted_dict(cls, data: Dict[str, Any]) -> "ToolCall":
+        """Build from a dict we serialized ourselves, bypassing __init__"""
+        tool_call = cls.__new__(cls)
+        tool_call.id = data.get("id", "")
+        tool_call.type = data.get("type", "function")
+        tool_call.function = data.get("function", {})
+        return tool_call
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Unified message format"""
     role: MessageRole
@@ -41,6 +50,25 @@ class Message:
     tool_calls: Optional[List[ToolCall]] = None
     tool_call_id: Optional[str] = None  # For tool response messages
     
+    @classmethod
+    def _from_trusted_dict(cls, data: Dict[str, Any], role: MessageRole) -> "Message":
+        """
+        Build from a dict produced by to_dict(), bypassing __init__
+        
+        Only for data we wrote ourselves (e.g. resumed llm_messages.json);
+        content is taken as-is and the role must already be parsed.
+        """
+        message = cls.__new__(cls)
+        message.role = role
+        message.content = data.get("content", "")
+        message.name = data.get("name")
+        tool_calls = data.get("tool_calls")
+        message.tool_calls = (
+            [ToolCall._from_trusted_dict(tc) for tc in tool_calls] if tool_calls else None
+        )
+        message.tool_call_id = data.get("tool_call_id")
+        return message
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format"""
         result: Dict[str, Any] = {"role": self.role.value}
@@ -2,7 +2,7 @@
 LLM Factory - Create LLM instances based on provider
 """
 
-from typing import Optional
+from typing import Any, Optional
 
 from codefuse.llm.base import BaseLLM
 from codefuse.llm.providers.openai_compatible import OpenAICompatibleLLM
@@ -22,6 +22,7 @@ def create_llm(
     top_k: Optional[int] = None,
     top_p: Optional[float] = None,
     session_id: Optional[str] = None,
+    http_client: Optional[Any] = None,
     **kwargs
 ) -> BaseLLM:
     """
@@ -43,6 +44,7 @@ def create_llm(
         top_k: Top-k sampling parameter (default: None)
         top_p: Nucleus sampling parameter (0-1, default: None)
         session_id: Session ID for Anthropic provider (used for x-idealab-session-id header)
+        http_client: Optional shared httpx.Client for OpenAI-SDK based providers
         **kwargs: Additional provider-specific parameters
         
     Returns:
@@ -92,6 +94,7 @@ def create_llm(
             top_k=top_k,
             top_p=top_p,
             session_id=session_id,
+            http_client=http_client,
             **kwargs
         )
     
@@ -124,6 +127,7 @@ def create_llm(
             enable_thinking=enable_thinking,
             top_k=top_k,
             top_p=top_p,
+            http_client=http_client,
             **kwargs
         )
     
@@ -143,5 +147,6 @@ def create_llm(
             enable_thinking=enable_thinking,
             top_k=top_k,
             top_p=top_p,
+            http_client=http_client,
             **kwargs
         )
\ No newline at end of file
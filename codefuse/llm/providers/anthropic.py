@@ -20,7 +20,9 @@ class AnthropicLLM(OpenAICompatibleLLM):
     prompt caching by marking the last Tool message with cache_control.
     
     Caching Strategy:
-    - If messages end with USER: No cache marker (new request, short context)
+    - The leading System message is always marked, so the stable prefix
+      (tool schemas + system prompt) is reused even on a fresh user turn
+    - If messages end with USER: No further marker (new request)
     - If messages end with TOOL: Add cache_control to last Tool message
     
     This allows caching of accumulated context during agent loops while
@@ -43,19 +45,16 @@ class AnthropicLLM(OpenAICompatibleLLM):
         # Store session_id before calling parent __init__
         self._session_id = session_id
         
+        # Send the session header (if any) from the client the parent creates
+        if session_id:
+            kwargs['default_headers'] = {
+                **(kwargs.get('default_headers') or {}),
+                'x-idealab-session-id': session_id,
+            }
+        
         super().__init__(**kwargs)
         
-        # Recreate client with custom header if session_id is provided
         if session_id:
-            from openai import OpenAI
-            self.client = OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url,
-                timeout=self.timeout,
-                default_headers={
-                    'x-idealab-session-id': session_id
-                }
-            )
             mainLogger.info(
                 f"Initialized Anthropic LLM with KV cache support: model={self.model}, "
                 f"base_url={self.base_url}, session_id={session_id}"
@@ -75,7 +74,8 @@ class AnthropicLLM(OpenAICompatibleLLM):
         Convert internal Message format to Anthropic format with cache control
         
         This method extends the parent's _convert_messages to add cache_control
-        markers on the last Tool message (if messages end with TOOL role).
+        markers on the System message and on the last Tool message (if
+        messages end with TOOL role).
         
         Args:
             messages: List of internal Message objects
@@ -90,6 +90,11 @@ class AnthropicLLM(OpenAICompatibleLLM):
         if not messages or len(messages) == 0:
             return openai_messages
         
+        # Stable prefix breakpoint: tools and system prompt never change
+        # within a session (one of the provider's four breakpoints)
+        if messages[0].role == MessageRole.SYSTEM and len(messages) > 1:
+            openai_messages[0]["cache_control"] = {"type": "ephemeral"}
+        
         last_message = messages[-1]
         
         # Only add cache control if last message is TOOL
@@ -43,15 +43,29 @@ class OpenAICompatibleLLM(BaseLLM):
     - Any other OpenAI-compatible API
     """
     
-    def __init__(self, **kwargs):
-        """Initialize OpenAI compatible client"""
+    def __init__(
+        self,
+        http_client: Optional[Any] = None,
+        default_headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ):
+        """
+        Initialize OpenAI compatible client
+        
+        Args:
+            http_client: Optional shared httpx.Client (see codefuse.llm._http_pool)
+            default_headers: Optional headers sent with every request
+            **kwargs: Parameters passed to BaseLLM
+        """
         super().__init__(**kwargs)
         
         # Create OpenAI client
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=self.base_url,
-            timeout=self.timeout
+            timeout=self.timeout,
+            default_headers=default_headers,
+            http_client=http_client,
         )
         
         mainLogger.info(
@@ -16,6 +16,7 @@ from .logging import (
     mainLogger,
     get_session_dir,
     close_all_loggers,
+    register_writer,
 )
 
 # HTTP logging exports
@@ -27,6 +28,7 @@ from .http_logger import (
 # Writer exports
 from .trajectory import TrajectoryWriter
 from .llm_messages import LLMMessagesWriter
+from .async_writer import AsyncJSONLWriter
 
 # Metrics exports
 from .metrics import (
@@ -49,12 +51,14 @@ __all__ = [
     "mainLogger",
     "get_session_dir",
     "close_all_loggers",
+    "register_writer",
     # HTTP Logging
     "HTTPLogger",
     "create_http_logger",
     # Writers
     "TrajectoryWriter",
     "LLMMessagesWriter",
+    "AsyncJSONLWriter",
     # Metrics - Models
     "ToolCallMetric",
     "APICallMetric",
@@ -0,0 +1,132 @@
+"""
+Async JSONL Writer - Moves file writes for observability sinks off the caller's thread
+"""
+
+import queue
+import threading
+from pathlib import Path
+from typing import List, Optional, Union
+
+
+_CLOSE = object()
+
+
+class AsyncJSONLWriter:
+    """
+    Appends pre-serialized lines to a file from a background thread
+    
+    Producers enqueue bytes and return immediately; a single daemon thread
+    drains the queue in batches and issues one write per batch. The queue
+    is bounded so a slow disk applies backpressure instead of growing memory.
+    """
+    
+    def __init__(
+        self,
+        file_path: Path,
+        max_queue_size: int = 4096,
+        batch_size: int = 256,
+        buffer_size: int = 1 << 20,
+    ):
+        """
+        Initialize async writer and start its consumer thread
+        
+        Args:
+            file_path: Path to the file to append to
+            max_queue_size: Maximum number of pending items before write() blocks
+            batch_size: Maximum number of items joined into a single write
+            buffer_size: Size of the underlying file buffer in bytes
+                (0 disables buffering: each batch is issued as one write)
+        """
+        self.file_path = Path(file_path)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        
+        self._file_handle = open(self.file_path, 'ab', buffering=buffer_size)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name=f"AsyncJSONLWriter-{self.file_path.name}",
+        )
+        self._thread.start()
+    
+    def write(self, data: bytes) -> None:
+        """
+        Enqueue one serialized line (must already end with a newline)
+        
+        Args:
+            data: Bytes to append
+        """
+        if self._closed:
+            raise ValueError(f"write to closed AsyncJSONLWriter: {self.file_path}")
+        self._queue.put(data)
+    
+    def flush(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Block until everything enqueued so far has been written and flushed
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+    
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Drain pending writes, stop the consumer thread and close the file
+        
+        Args:
+            timeout: Maximum seconds to wait for the consumer thread
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join(timeout)
+    
+    def _run(self) -> None:
+        """Consumer loop: batch pending items into single writes"""
+        while True:
+            items: List[Union[bytes, threading.Event, object]] = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            chunk: List[bytes] = []
+            for item in items:
+                if isinstance(item, bytes):
+                    chunk.append(item)
+                    continue
+                
+                # Control item: write what precedes it first to keep ordering
+                if chunk:
+                    self._write(b"".join(chunk))
+                    chunk = []
+                self._flush()
+                if item is _CLOSE:
+                    self._file_handle.close()
+                    return
+                item.set()
+            
+            if chunk:
+                self._write(b"".join(chunk))
+    
+    def _write(self, data: bytes) -> None:
+        """Write a batch, reporting (not raising) failures on the consumer thread"""
+        try:
+            self._file_handle.write(data)
+        except Exception as e:
+            print(f"[AsyncJSONLWriter] Failed to write {self.file_path}: {e}", flush=True)
+    
+    def _flush(self) -> None:
+        """Flush the file buffer, reporting (not raising) failures"""
+        try:
+            self._file_handle.flush()
+        except Exception as e:
+            print(f"[AsyncJSONLWriter] Failed to flush {self.file_path}: {e}", flush=True)
@@ -8,7 +8,6 @@ Features:
 - Thread-safe for Gunicorn multi-worker setup
 """
 
-import json
 import os
 import threading
 import time
@@ -17,6 +16,9 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 import atexit
 
+from codefuse import _json
+from .async_writer import AsyncJSONLWriter
+
 
 class HTTPLogger:
     """Thread-safe HTTP request logger with rotation and cleanup"""
@@ -48,15 +50,48 @@ class HTTPLogger:
         # Current date for rotation check
         self._current_date = datetime.now().date()
         
+        # Background appenders, opened on first write (i.e. inside each worker
+        # process). They are unbuffered, so every drained batch is one O_APPEND
+        # write and lines from concurrent workers never interleave mid-line.
+        self._json_log_paths: Dict[str, Path] = {}
+        self._access_log_file: Optional[AsyncJSONLWriter] = None
+        self._json_log_file: Optional[AsyncJSONLWriter] = None
+        self._error_log_file: Optional[AsyncJSONLWriter] = None
+        
         # Register cleanup on exit
         atexit.register(self.stop_cleanup_thread)
+        atexit.register(self.close)
     
     def _get_json_log_path(self, date: Optional[datetime] = None) -> Path:
-        """Get JSON log file path for a specific date"""
+        """Get JSON log file path for a specific date (memoized per date)"""
         if date is None:
             date = datetime.now()
         date_str = date.strftime("%Y%m%d")
-        return self.log_dir / f"access-{date_str}.json"
+        path = self._json_log_paths.get(date_str)
+        if path is None:
+            if len(self._json_log_paths) >= 64:
+                self._json_log_paths.clear()
+            path = self.log_dir / f"access-{date_str}.json"
+            self._json_log_paths[date_str] = path
+        return path
+    
+    @staticmethod
+    def _open_writer(path: Path) -> AsyncJSONLWriter:
+        """Open a background appender issuing one write per batch"""
+        return AsyncJSONLWriter(path, buffer_size=0)
+    
+    def close(self) -> None:
+        """Drain queued entries and close the log writers"""
+        with self._write_lock:
+            for handle in (self._access_log_file, self._json_log_file, self._error_log_file):
+                if handle is not None:
+                    try:
+                        handle.close()
+                    except Exception:
+                        pass
+            self._access_log_file = None
+            self._json_log_file = None
+            self._error_log_file = None
     
     def _format_text_log(
         self,
@@ -67,12 +102,12 @@ class HTTPLogger:
         duration: float,
         tool_name: Optional[str] = None,
         workdir: Optional[str] = None,
-    ) -> str:
+    ) -> bytes:
         """Format log entry as human-readable text"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         tool_info = f" | tool:{tool_name}" if tool_name else ""
         workdir_info = f" | wd:{workdir}" if workdir else ""
-        return f"{timestamp} | {method} {path} | {status} | {duration:.3f}s | {request_id}{tool_info}{workdir_info}\n"
+        return f"{timestamp} | {method} {path} | {status} | {duration:.3f}s | {request_id}{tool_info}{workdir_info}\n".encode("utf-8")
     
     def _format_json_log(
         self,
@@ -86,8 +121,8 @@ class HTTPLogger:
         workdir: Optional[str] = None,
         success: Optional[bool] = None,
         error: Optional[str] = None,
-    ) -> str:
-        """Format log entry as JSON"""
+    ) -> bytes:
+        """Format log entry as a JSON line"""
         log_data = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "request_id": request_id,
@@ -108,7 +143,7 @@ class HTTPLogger:
         if error:
             log_data["error"] = error
         
-        return json.dumps(log_data, ensure_ascii=False) + "\n"
+        return _json.dumps_line(log_data)
     
     def log_request(
         self,
@@ -126,7 +161,9 @@ class HTTPLogger:
         """
         Log HTTP request to both text and JSON files
         
-        Thread-safe for concurrent writes from multiple workers.
+        Entries are queued and written by background threads, so the request
+        does not wait on disk I/O. Thread-safe for concurrent writes from
+        multiple workers.
         """
         with self._write_lock:
             try:
@@ -134,22 +171,26 @@ class HTTPLogger:
                 current_date = datetime.now().date()
                 if current_date != self._current_date:
                     self._current_date = current_date
+                    if self._json_log_file is not None:
+                        self._json_log_file.close()
+                        self._json_log_file = None
                 
                 # Write text log
                 text_entry = self._format_text_log(
                     request_id, method, path, status, duration, tool_name, workdir
                 )
-                with open(self.access_log_path, 'a', encoding='utf-8') as f:
-                    f.write(text_entry)
+                if self._access_log_file is None:
+                    self._access_log_file = self._open_writer(self.access_log_path)
+                self._access_log_file.write(text_entry)
                 
                 # Write JSON log
                 json_entry = self._format_json_log(
                     request_id, method, path, status, duration,
                     tool_name, tool_args, workdir, success, error
                 )
-                json_log_path = self._get_json_log_path()
-                with open(json_log_path, 'a', encoding='utf-8') as f:
-                    f.write(json_entry)
+                if self._json_log_file is None:
+                    self._json_log_file = self._open_writer(self._get_json_log_path())
+                self._json_log_file.write(json_entry)
                 
             except Exception as e:
                 # Avoid blocking the request if logging fails
@@ -179,9 +220,9 @@ class HTTPLogger:
                 if traceback:
                     error_data["traceback"] = traceback
                 
-                error_entry = json.dumps(error_data, ensure_ascii=False) + "\n"
-                with open(self.error_log_path, 'a', encoding='utf-8') as f:
-                    f.write(error_entry)
+                if self._error_log_file is None:
+                    self._error_log_file = self._open_writer(self.error_log_path)
+                self._error_log_file.write(_json.dumps_line(error_data))
                 
             except Exception as e:
                 print(f"[HTTPLogger] Failed to write error log: {e}", flush=True)
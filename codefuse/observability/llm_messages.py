@@ -3,16 +3,25 @@ LLM Messages Writer - Records latest LLM messages snapshot
 """
 
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from codefuse import _json
+from .async_writer import AsyncJSONLWriter
 
 
 class LLMMessagesWriter:
     """
     Writes the latest LLM messages snapshot to a JSON file
     
-    This writer uses overwrite mode, keeping only the most recent state.
+    Each write appends only the messages that changed since the previous
+    write to a JSONL sidecar (``<name>.jsonl``). The full JSON snapshot is
+    rewritten on ``flush()`` (the CLI flushes when a turn finishes or fails)
+    and on ``close()``, so the JSON file can be inspected while a session
+    runs and lags at most the turn in progress. If the process dies before
+    closing, ``read_snapshot()`` rebuilds the latest state from the sidecar.
     Useful for debugging and inspecting the current conversation context.
     """
     
@@ -25,10 +34,24 @@ class LLMMessagesWriter:
         """
         self.file_path = Path(file_path)
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path = self.journal_path_for(self.file_path)
+        self._file_handle: Optional[AsyncJSONLWriter] = None
+        self._messages: List[Dict[str, Any]] = []
+        self._tools: Optional[List[Dict[str, Any]]] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_dirty = False
+    
+    @staticmethod
+    def journal_path_for(file_path: Path) -> Path:
+        """Get the JSONL sidecar path for a snapshot file"""
+        return Path(file_path).with_suffix(".jsonl")
     
     def write(self, formatted_data: Dict[str, Any]):
         """
-        Write LLM messages snapshot (overwrites existing file)
+        Record LLM messages snapshot
+        
+        Only the suffix of messages that differs from the previous write is
+        appended to the sidecar, together with tools when they changed.
         
         Args:
             formatted_data: Formatted data containing messages and tools
@@ -39,12 +62,94 @@ class LLMMessagesWriter:
             'timestamp': datetime.now(timezone.utc).isoformat(),
             **formatted_data
         }
+        self._snapshot = snapshot
+        self._snapshot_dirty = True
+        
+        messages = snapshot.get('messages', [])
+        offset = 0
+        limit = min(len(messages), len(self._messages))
+        while offset < limit and messages[offset] == self._messages[offset]:
+            offset += 1
+        
+        record: Dict[str, Any] = {
+            'timestamp': snapshot['timestamp'],
+            'offset': offset,
+            'messages': messages[offset:],
+        }
+        for key, value in snapshot.items():
+            if key not in ('timestamp', 'messages', 'tools'):
+                record[key] = value
+        tools = snapshot.get('tools')
+        if tools != self._tools:
+            record['tools'] = tools
+            self._tools = tools
+        self._messages = list(messages)
         
-        # Write to file (overwrite mode)
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        if self._file_handle is None:
+            self._file_handle = AsyncJSONLWriter(self.journal_path)
+        self._file_handle.write(_json.dumps_line(record))
+    
+    def flush(self):
+        """Flush buffered sidecar records and rewrite the JSON snapshot"""
+        if self._file_handle:
+            self._file_handle.flush()
+        self._materialize()
     
     def close(self):
-        """Close method for consistency (no-op for this writer)"""
-        pass
-
+        """Materialize the JSON snapshot and remove the sidecar"""
+        if self._file_handle:
+            self._file_handle.close()
+            self._file_handle = None
+        
+        if self._snapshot is None:
+            return
+        
+        self._materialize()
+        self._snapshot = None
+        self.journal_path.unlink(missing_ok=True)
+    
+    def _materialize(self):
+        """Atomically replace the JSON snapshot if it changed since the last write"""
+        if self._snapshot is None or not self._snapshot_dirty:
+            return
+        
+        tmp_path = self.file_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._snapshot, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.file_path)
+        self._snapshot_dirty = False
+    
+    @classmethod
+    def read_snapshot(cls, file_path: Path) -> Dict[str, Any]:
+        """
+        Read a snapshot, rebuilding it from the JSONL sidecar when one is
+        left behind (the writer was not closed, e.g. after a crash)
+        
+        Args:
+            file_path: Path to the LLM messages JSON file
+        
+        Returns:
+            Snapshot dictionary with 'messages' and optionally 'tools'
+        
+        Raises:
+            FileNotFoundError: If neither the snapshot nor the sidecar exists
+        """
+        file_path = Path(file_path)
+        journal_path = cls.journal_path_for(file_path)
+        if not journal_path.exists():
+            with open(file_path, 'rb') as f:
+                return _json.loads(f.read())
+        
+        # Each writer starts with an offset-0 record, so replay is self-contained
+        snapshot: Dict[str, Any] = {'messages': []}
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = _json.loads(line)
+                except _json.JSONDecodeError:
+                    # Torn trailing record from an interrupted write
+                    break
+                offset = record.pop('offset', 0)
+                snapshot['messages'] = snapshot['messages'][:offset] + record.pop('messages', [])
+                snapshot.update(record)
+        return snapshot
@@ -25,6 +25,7 @@ from .setup import (
     mainLogger,
     get_session_dir,
     close_all_loggers,
+    register_writer,
 )
 
 __all__ = [
@@ -32,5 +33,6 @@ __all__ = [
     "mainLogger",
     "get_session_dir",
     "close_all_loggers",
+    "register_writer",
 ]
 
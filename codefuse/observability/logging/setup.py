@@ -4,12 +4,13 @@ import os
 import logging
 import structlog
 from pathlib import Path
-from typing import Optional
+from typing import Any, List, Optional, Union
 from .utils import path_to_slug
 
 # State tracking
 _logging_initialized = False
 _session_dir: Optional[Path] = None
+_writers: List[Any] = []
 
 def _json_formatter(logger, method_name, event_dict):
     """Custom formatter that outputs clean JSON lines"""
@@ -64,7 +65,7 @@ mainLogger = structlog.get_logger("codefuse.main")
 def setup_logging(
     session_id: str,
     workspace_path: Optional[str] = None,
-    logs_dir: str = "~/.cfuse/logs",
+    logs_dir: Union[str, Path] = "~/.cfuse/logs",
     verbose: bool = False,
 ) -> Path:
     """
@@ -120,8 +121,20 @@ def get_session_dir() -> Optional[Path]:
     return _session_dir
 
 
+def register_writer(writer: Any) -> None:
+    """Register an observability writer to be flushed and closed by close_all_loggers"""
+    _writers.append(writer)
+
+
 def close_all_loggers():
     """Close all logger handlers and flush buffers"""
+    while _writers:
+        writer = _writers.pop()
+        try:
+            writer.close()
+        except Exception as e:
+            mainLogger.warning("Failed to close writer", writer=type(writer).__name__, error=str(e))
+    
     logger = logging.getLogger("codefuse.main")
     for handler in logger.handlers[:]:
         handler.close()
@@ -1,6 +1,7 @@
 """Utility functions for logging module"""
 
 import os
+from functools import lru_cache
 
 
 def path_to_slug(path: str) -> str:
@@ -11,8 +12,13 @@ def path_to_slug(path: str) -> str:
         /Users/mingmu/projects/app -> Users-mingmu-projects-app
         /home/user/my project -> home-user-my_project
     """
-    abs_path = os.path.abspath(path)
-    
+    # abspath depends on the current directory, so only the slugging is cached
+    return _slug_from_abspath(os.path.abspath(path))
+
+
+@lru_cache(maxsize=64)
+def _slug_from_abspath(abs_path: str) -> str:
+    """Slug an absolute path (cached; workspaces repeat across calls)"""
     # Remove leading slash
     if abs_path.startswith('/'):
         abs_path = abs_path[1:]
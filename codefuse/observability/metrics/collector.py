@@ -319,64 +319,73 @@ class MetricsCollector:
         if self.session_metric.end_time is None:
             self.end_session()
         
-        # Aggregate API call metrics
-        all_api_calls = []
-        for prompt in self.session_metric.prompts:
-            all_api_calls.extend(prompt.api_calls)
-        
-        api_success_count = sum(1 for api in all_api_calls if api.success)
-        api_total_count = len(all_api_calls)
-        api_success_rate = (api_success_count / api_total_count * 100) if api_total_count > 0 else 0
-        
-        total_prompt_tokens = sum(api.prompt_tokens or 0 for api in all_api_calls)
-        total_completion_tokens = sum(api.completion_tokens or 0 for api in all_api_calls)
-        total_tokens = sum(api.total_tokens or 0 for api in all_api_calls)
-        total_cache_read_tokens = sum(api.cache_read_tokens or 0 for api in all_api_calls)
-        total_cache_creation_tokens = sum(api.cache_creation_tokens or 0 for api in all_api_calls)
+        # Aggregate API call metrics in a single pass
+        api_total_count = 0
+        api_success_count = 0
+        total_prompt_tokens = 0
+        total_completion_tokens = 0
+        total_tokens = 0
+        total_cache_read_tokens = 0
+        total_cache_creation_tokens = 0
+        api_duration_sum = 0.0
+        api_duration_count = 0
+        model_name = None
         
-        api_durations = [api.duration for api in all_api_calls if api.duration is not None]
-        avg_api_duration = (sum(api_durations) / len(api_durations)) if api_durations else 0
+        # Aggregate tool call metrics alongside
+        tool_total_count = 0
+        tool_success_count = 0
+        tool_duration_sum = 0.0
+        tool_duration_count = 0
+        tool_call_breakdown = {}
         
-        # Aggregate tool call metrics
-        all_tool_calls = []
         for prompt in self.session_metric.prompts:
-            all_tool_calls.extend(prompt.tool_calls)
+            for api in prompt.api_calls:
+                api_total_count += 1
+                if api.success:
+                    api_success_count += 1
+                total_prompt_tokens += api.prompt_tokens or 0
+                total_completion_tokens += api.completion_tokens or 0
+                total_tokens += api.total_tokens or 0
+                total_cache_read_tokens += api.cache_read_tokens or 0
+                total_cache_creation_tokens += api.cache_creation_tokens or 0
+                if api.duration is not None:
+                    api_duration_sum += api.duration
+                    api_duration_count += 1
+                # Model name comes from the first API call that reported one
+                if model_name is None and api.model:
+                    model_name = api.model
+            
+            for tool in prompt.tool_calls:
+                tool_total_count += 1
+                if tool.duration is not None:
+                    tool_duration_sum += tool.duration
+                    tool_duration_count += 1
+                
+                # Tool call breakdown by name
+                breakdown = tool_call_breakdown.get(tool.tool_name)
+                if breakdown is None:
+                    breakdown = tool_call_breakdown[tool.tool_name] = {
+                        "count": 0,
+                        "success": 0,
+                        "failed": 0,
+                    }
+                breakdown["count"] += 1
+                if tool.success:
+                    tool_success_count += 1
+                    breakdown["success"] += 1
+                else:
+                    breakdown["failed"] += 1
         
-        tool_success_count = sum(1 for tool in all_tool_calls if tool.success)
-        tool_total_count = len(all_tool_calls)
+        api_success_rate = (api_success_count / api_total_count * 100) if api_total_count > 0 else 0
+        avg_api_duration = (api_duration_sum / api_duration_count) if api_duration_count else 0
         tool_success_rate = (tool_success_count / tool_total_count * 100) if tool_total_count > 0 else 0
-        
-        tool_durations = [tool.duration for tool in all_tool_calls if tool.duration is not None]
-        avg_tool_duration = (sum(tool_durations) / len(tool_durations)) if tool_durations else 0
-        
-        # Tool call breakdown by name
-        tool_call_breakdown = {}
-        for tool in all_tool_calls:
-            name = tool.tool_name
-            if name not in tool_call_breakdown:
-                tool_call_breakdown[name] = {
-                    "count": 0,
-                    "success": 0,
-                    "failed": 0,
-                }
-            tool_call_breakdown[name]["count"] += 1
-            if tool.success:
-                tool_call_breakdown[name]["success"] += 1
-            else:
-                tool_call_breakdown[name]["failed"] += 1
+        avg_tool_duration = (tool_duration_sum / tool_duration_count) if tool_duration_count else 0
         
         # Prompt-level metrics
         prompt_durations = [p.duration for p in self.session_metric.prompts if p.duration is not None]
         avg_prompt_duration = (sum(prompt_durations) / len(prompt_durations)) if prompt_durations else 0
         total_iterations = sum(p.iterations for p in self.session_metric.prompts)
         
-        # Get model name from first successful API call
-        model_name = None
-        for api in all_api_calls:
-            if api.model:
-                model_name = api.model
-                break
-        
         # Calculate cost
         cost_info = calculate_cost(
             prompt_tokens=total_prompt_tokens,
@@ -2,11 +2,13 @@
 Trajectory Writer - Records agent execution events to JSONL format
 """
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from codefuse import _json
+from .async_writer import AsyncJSONLWriter
+
 
 class TrajectoryWriter:
     """
@@ -14,8 +16,12 @@ class TrajectoryWriter:
     
     Each event is a JSON object on a separate line, enabling:
     - Streaming writes (append-only)
-    - Real-time monitoring (tail -f)
+    - Monitoring (tail -f; events appear once flushed)
     - Easy parsing (line-by-line)
+    
+    Events are serialized on the caller's thread and appended by a background
+    AsyncJSONLWriter, which batches them into large buffered writes. Data is
+    guaranteed on disk only after flush()/close().
     """
     
     def __init__(self, file_path: Path):
@@ -26,14 +32,13 @@ class TrajectoryWriter:
             file_path: Path to the trajectory JSONL file
         """
         self.file_path = Path(file_path)
-        self._file_handle: Optional[Any] = None
+        self._file_handle: Optional[AsyncJSONLWriter] = None
         self._opened = False
     
     def _ensure_open(self):
         """Ensure file handle is open"""
         if not self._opened:
-            self.file_path.parent.mkdir(parents=True, exist_ok=True)
-            self._file_handle = open(self.file_path, 'a', encoding='utf-8')
+            self._file_handle = AsyncJSONLWriter(self.file_path)
             self._opened = True
     
     def write(self, event_data: Dict[str, Any]):
@@ -52,9 +57,7 @@ class TrajectoryWriter:
             event_data['timestamp'] = datetime.now(timezone.utc).isoformat()
         
         # Write as single line JSON
-        json_line = json.dumps(event_data, ensure_ascii=False)
-        self._file_handle.write(json_line + '\n')
-        self._file_handle.flush()
+        self._file_handle.write(_json.dumps_line(event_data))
     
     def write_summary(self, summary_data: Dict[str, Any]):
         """
@@ -72,6 +75,11 @@ class TrajectoryWriter:
         }
         self.write(event)
     
+    def flush(self):
+        """Flush buffered events to disk"""
+        if self._opened and self._file_handle:
+            self._file_handle.flush()
+    
     def close(self):
         """Close the file handle"""
         if self._opened and self._file_handle:
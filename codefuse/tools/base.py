@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """
     Result of a tool execution
@@ -29,7 +29,7 @@ class ToolResult:
         return self.content
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolParameter:
     """Definition of a tool parameter"""
     name: str
@@ -49,7 +49,7 @@ class ToolParameter:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolDefinition:
     """Definition of a tool"""
     name: str
@@ -119,6 +119,19 @@ class BaseTool(ABC):
         """
         return self.definition.requires_confirmation
     
+    @property
+    def is_read_only(self) -> bool:
+        """
+        Check if this tool only reads from the environment
+        
+        Consecutive calls to read-only tools within one LLM turn may run
+        concurrently, so they must not depend on each other's side effects.
+        
+        Returns:
+            True if the tool has no side effects, False otherwise
+        """
+        return False
+    
     @abstractmethod
     def execute(self, **kwargs) -> ToolResult:
         """
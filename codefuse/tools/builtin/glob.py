@@ -47,6 +47,11 @@ class GlobTool(FileSystemToolMixin, BaseTool):
         """
         super().__init__(workspace_root=workspace_root)
     
+    @property
+    def is_read_only(self) -> bool:
+        """Only reads the workspace"""
+        return True
+    
     @property
     def definition(self) -> ToolDefinition:
         """Define the glob tool"""
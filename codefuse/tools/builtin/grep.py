@@ -51,6 +51,11 @@ class GrepTool(FileSystemToolMixin, BaseTool):
         """
         super().__init__(workspace_root=workspace_root)
     
+    @property
+    def is_read_only(self) -> bool:
+        """Only reads the workspace"""
+        return True
+    
     @property
     def definition(self) -> ToolDefinition:
         """Define the grep tool"""
@@ -92,6 +92,11 @@ class ListDirectoryTool(FileSystemToolMixin, BaseTool):
         """
         super().__init__(workspace_root=workspace_root)
     
+    @property
+    def is_read_only(self) -> bool:
+        """Only reads the workspace"""
+        return True
+    
     @property
     def definition(self) -> ToolDefinition:
         """Define the list_directory tool"""
@@ -46,6 +46,11 @@ class ReadFileTool(FileSystemToolMixin, BaseTool):
         super().__init__(workspace_root=workspace_root)
         self._read_tracker = read_tracker
     
+    @property
+    def is_read_only(self) -> bool:
+        """Only reads the workspace"""
+        return True
+    
     @property
     def definition(self) -> ToolDefinition:
         """Define the read_file tool"""
@@ -21,8 +21,14 @@ class ToolRegistry:
     def __init__(self):
         """Initialize empty tool registry"""
         self._tools: Dict[str, BaseTool] = {}
+        self._version = 0
         mainLogger.info("Initialized empty ToolRegistry")
     
+    @property
+    def version(self) -> int:
+        """Counter bumped on every registration, for invalidating derived caches"""
+        return self._version
+    
     def register(self, tool: BaseTool) -> None:
         """
         Register a tool
@@ -35,6 +41,7 @@ class ToolRegistry:
             mainLogger.warning("Tool already registered, overwriting", tool_name=name)
         
         self._tools[name] = tool
+        self._version += 1
         mainLogger.info(
             "Registered tool",
             tool_name=name,
@@ -114,6 +121,8 @@ def create_default_registry(
     workspace_root: Optional["Path"] = None,
     read_tracker: Optional[Any] = None,
     config: Optional[Any] = None,
+    resolved: bool = False,
+    include_bash: bool = True,
 ) -> ToolRegistry:
     """
     Create a default tool registry with all built-in tools
@@ -123,6 +132,12 @@ def create_default_registry(
                        Defaults to current working directory.
         read_tracker: Optional read tracker for file read tracking (needed by ReadFileTool/EditFileTool).
         config: Optional configuration object for tool-specific settings.
+        resolved: Whether workspace_root is already absolute and resolved
+                  (skips the realpath walk).
+        include_bash: Whether to register BashTool. Its shell session is
+                      per-instance state, so callers sharing a registry
+                      between independent requests build it separately
+                      with create_bash_tool().
     
     Returns:
         ToolRegistry with all built-in tools registered
@@ -135,13 +150,15 @@ def create_default_registry(
         ListDirectoryTool,
         GrepTool,
         GlobTool,
-        BashTool,
     )
     
     registry = ToolRegistry()
     
     # Resolve workspace_root
-    workspace = (workspace_root or Path.cwd()).resolve()
+    if workspace_root is not None and resolved:
+        workspace = workspace_root
+    else:
+        workspace = (workspace_root or Path.cwd()).resolve()
     
     # Register built-in tools with workspace_root
     # ReadFileTool and EditFileTool need read_tracker for file read tracking
@@ -152,17 +169,8 @@ def create_default_registry(
     registry.register(GrepTool(workspace_root=workspace))
     registry.register(GlobTool(workspace_root=workspace))
     
-    # Register BashTool with configuration
-    bash_timeout = config.agent_config.bash_timeout if config else 30
-    bash_allowed = config.agent_config.bash_allowed_commands if config else []
-    bash_disallowed = config.agent_config.bash_disallowed_commands if config else []
-    
-    registry.register(BashTool(
-        workspace_root=workspace,
-        timeout=bash_timeout,
-        allowed_commands=bash_allowed,
-        disallowed_commands=bash_disallowed,
-    ))
+    if include_bash:
+        registry.register(create_bash_tool(workspace, config))
     
     mainLogger.info(
         "Created default registry",
@@ -172,3 +180,28 @@ def create_default_registry(
     
     return registry
 
+
+
+def create_bash_tool(workspace_root: "Path", config: Optional[Any] = None) -> BaseTool:
+    """
+    Create a BashTool configured from the agent config
+    
+    Args:
+        workspace_root: Resolved workspace root directory
+        config: Optional configuration object for bash settings
+    
+    Returns:
+        BashTool with its own shell session
+    """
+    from codefuse.tools.builtin import BashTool
+    
+    bash_timeout = config.agent_config.bash_timeout if config else 30
+    bash_allowed = config.agent_config.bash_allowed_commands if config else []
+    bash_disallowed = config.agent_config.bash_disallowed_commands if config else []
+    
+    return BashTool(
+        workspace_root=workspace_root,
+        timeout=bash_timeout,
+        allowed_commands=bash_allowed,
+        disallowed_commands=bash_disallowed,
+    )